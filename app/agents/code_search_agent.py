@@ -1,13 +1,51 @@
 from typing import List
 from app.models import DocTaskState, CodeChunk
-from app.tools.code_search import search_code
+from app.tools.code_search import search_code, get_chunks_by_ids
+from app.tools.heuristics import is_private_symbol, is_test_file
 
 
 def run_code_search_agent(state: DocTaskState) -> DocTaskState:
     """
     Use embedding-based search to pick relevant code chunks.
+
+    When the planner found the module in the index, the planned symbols
+    are used directly (possibly none) and the query search only re-ranks
+    them; otherwise this falls back to a plain search sized by the plan's
+    `top_k`, dropping private helpers and (for non-test modules) test-file
+    symbols the same way the planner would.
     """
+    plan = state.plan
+    top_k = plan.top_k if plan is not None else 10
     query = state.query or f"Key APIs related to module {state.module_path}"
-    chunks: List[CodeChunk] = search_code(query, top_k=10)
-    state.selected_chunks = chunks
+
+    if plan is None or not plan.module_indexed:
+        print(f"[WARN] {state.module_path} is not in the index; falling back to search.")
+        module_is_test = is_test_file(state.module_path)
+        chunks: List[CodeChunk] = []
+        for chunk in search_code(query, top_k=top_k):
+            if is_private_symbol(chunk.symbol_name):
+                reason = "private"
+            elif is_test_file(chunk.file_path) and not module_is_test:
+                reason = "test file"
+            else:
+                chunks.append(chunk)
+                continue
+            if plan is not None:
+                plan.skipped[chunk.symbol_name] = reason
+        state.selected_chunks = chunks
+        return state
+
+    if not plan.chunk_ids:
+        # Module is indexed but the planner kept nothing worth documenting
+        state.selected_chunks = []
+        return state
+
+    planned = get_chunks_by_ids(plan.chunk_ids)
+    if state.query:
+        hit_ids = [c.id for c in search_code(query, top_k=top_k)]
+        rank = {cid: pos for pos, cid in enumerate(hit_ids)}
+        # Search hits first (by search rank), then the planner's order
+        planned.sort(key=lambda c: rank.get(c.id, len(rank)))
+
+    state.selected_chunks = planned
     return state
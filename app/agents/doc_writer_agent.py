@@ -1,13 +1,41 @@
 from app.models import DocTaskState
+from app.agents.planner_agent import budget_exhausted, planned_symbol_names, record_llm_call
 from app.tools.doc_writer import generate_doc_for_chunk
+from app.tools.group_cache import get_group_doc_cache, is_shared_group
 
 
 def run_doc_writer_agent(state: DocTaskState) -> DocTaskState:
     """
     Generate Markdown docs for each selected chunk.
+
+    A dedup group is documented once across all runs: the doc is stored
+    in the group cache and reused when another module holding a copy is
+    documented. The doc is keyed by the chunk's planned names in this
+    module (its aliases there, not the canonical's name when the canonical
+    lives in another file). Stops early once the plan's budget is spent.
     """
     docs = {}
+    cache = get_group_doc_cache()
     for chunk in state.selected_chunks:
-        docs[chunk.symbol_name] = generate_doc_for_chunk(chunk)
+        names = planned_symbol_names(state, chunk)
+        if not names:
+            continue
+        cached = cache.get_doc(chunk.group_id) if is_shared_group(chunk) else None
+        if cached is not None:
+            doc = cached
+        elif budget_exhausted(state):
+            if state.plan is not None:
+                for name in names:
+                    state.plan.skipped.setdefault(name, "budget spent")
+            continue
+        else:
+            doc = generate_doc_for_chunk(
+                chunk, on_call=lambda record: record_llm_call(state, record)
+            )
+            if is_shared_group(chunk):
+                cache.put_doc(chunk.group_id, doc)
+
+        for name in names:
+            docs.setdefault(name, doc)
     state.draft_docs = docs
     return state
@@ -1,58 +1,42 @@
-from typing import Dict
-from groq import Groq
+from typing import Callable, Dict, Optional
+import time
 
-from app.models import DocTaskState
-from app.config import GROQ_API_KEY, GROQ_MODEL_NAME
+from app.models import DocTaskState, LLMCallRecord
+from app.agents.planner_agent import budget_exhausted, planned_symbol_names, record_llm_call
+from app.config import EVAL_RESPONSE_MAX_TOKENS
+from app.tools.group_cache import get_group_doc_cache, is_shared_group
+from app.tools.heuristics import estimate_tokens
+from app.tools.llm_backend import get_llm_backend
+from app.tools.prompt_builder import build_eval_prompt
 
-client = Groq(api_key=GROQ_API_KEY)
 
-EVAL_SYSTEM_PROMPT = (
-    "You are a strict documentation reviewer for Python APIs. "
-    "You score docs based on correctness, coverage, clarity, and consistency "
-    "with the given code."
-)
+def _evaluate_doc_with_llm(
+    code: str,
+    doc: str,
+    symbol_name: str = "",
+    on_call: Optional[Callable[[LLMCallRecord], None]] = None,
+) -> Dict:
+    # Code and doc are fitted into EVAL_PROMPT_MAX_TOKENS
+    prompt = build_eval_prompt(code, doc)
 
-EVAL_USER_TEMPLATE = (
-    "You are given:\n\n"
-    "1. The Python code for a function or class.\n"
-    "2. The generated documentation in Markdown.\n\n"
-    "Please score the documentation on the following 4 criteria from 1 (poor) to 5 (excellent):\n\n"
-    "- correctness: does it accurately describe the behavior?\n"
-    "- coverage: does it mention key parameters, return value, and side effects?\n"
-    "- clarity: is it easy to understand?\n"
-    "- consistency: does it avoid inventing parameters/behavior not in the code?\n\n"
-    "Respond ONLY as a JSON object with this exact structure:\n\n"
-    "{{\n"
-    '  "correctness": <int 1-5>,\n'
-    '  "coverage": <int 1-5>,\n'
-    '  "clarity": <int 1-5>,\n'
-    '  "consistency": <int 1-5>,\n'
-    '  "overall_score": <int 1-5>\n'
-    "}}\n\n"
-    "CODE:\n"
-    "```python\n"
-    "{code}\n"
-    "```\n\n"
-    "DOC:\n"
-    "```markdown\n"
-    "{doc}\n"
-    "```"
-)
-
-
-def _evaluate_doc_with_groq(code: str, doc: str) -> Dict:
-    user_prompt = EVAL_USER_TEMPLATE.format(code=code, doc=doc)
-
-    completion = client.chat.completions.create(
-        model=GROQ_MODEL_NAME,
-        messages=[
-            {"role": "system", "content": EVAL_SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt},
-        ],
+    started = time.monotonic()
+    content = get_llm_backend().chat(
+        prompt.system,
+        prompt.user,
         temperature=0.0,
+        max_tokens=EVAL_RESPONSE_MAX_TOKENS,
     )
-
-    content = completion.choices[0].message.content
+    if on_call is not None:
+        on_call(
+            LLMCallRecord(
+                kind="eval",
+                symbol_name=symbol_name,
+                prompt_tokens=prompt.prompt_tokens,
+                response_tokens=estimate_tokens(content),
+                condensed=prompt.condensed,
+                latency_s=time.monotonic() - started,
+            )
+        )
 
     import json
 
@@ -72,18 +56,42 @@ def _evaluate_doc_with_groq(code: str, doc: str) -> Dict:
 
 def run_evaluator_agent(state: DocTaskState) -> DocTaskState:
     """
-    Evaluate each draft doc using LLM-as-judge via Groq.
+    Evaluate each draft doc using LLM-as-judge via the configured backend.
+
+    Each dedup group is judged once across all runs: scores for the
+    group's shared doc are stored in the group cache and reused for its
+    copies in other modules, and for the chunk's other names in this
+    module that received the same doc.
+    Stops early once the plan's budget is spent.
     """
     evaluations: Dict[str, Dict] = {}
+    cache = get_group_doc_cache()
 
     for chunk in state.selected_chunks:
-        symbol = chunk.symbol_name
-        doc = state.draft_docs.get(symbol)
-        if not doc:
+        names = [n for n in planned_symbol_names(state, chunk) if state.draft_docs.get(n)]
+        if not names:
+            continue
+        doc = state.draft_docs[names[0]]
+
+        cached = cache.get_evaluation(chunk.group_id, doc) if is_shared_group(chunk) else None
+        if cached is not None:
+            scores = cached
+        elif budget_exhausted(state):
             continue
+        else:
+            scores = _evaluate_doc_with_llm(
+                chunk.code,
+                doc,
+                symbol_name=names[0],
+                on_call=lambda record: record_llm_call(state, record),
+            )
+            # Unparseable judge output is not worth keeping for other runs
+            if is_shared_group(chunk) and scores.get("overall_score") is not None:
+                cache.put_evaluation(chunk.group_id, doc, scores)
 
-        scores = _evaluate_doc_with_groq(chunk.code, doc)
-        evaluations[symbol] = scores
+        for name in names:
+            if state.draft_docs[name] == doc:
+                evaluations.setdefault(name, scores)
 
     state.evaluations = evaluations
     return state
@@ -1,16 +1,128 @@
-from app.models import DocTaskState
+import time
+from typing import List, Tuple
+
+from app.config import (
+    PLANNER_MAX_SYMBOLS,
+    PLANNER_TOKEN_BUDGET,
+    PLANNER_LATENCY_BUDGET_S,
+)
+from app.models import DocPlan, DocTaskState, CodeChunk, LLMCallRecord
+from app.tools.code_search import get_module_chunks, module_occurrences
+from app.tools.heuristics import (
+    estimate_symbol_cost,
+    is_private_symbol,
+    symbol_importance,
+)
+
+MIN_TOP_K = 5
+MAX_TOP_K = 50
 
 
 def plan_doc_task(state: DocTaskState) -> DocTaskState:
     """
     Planner agent.
 
-    For now this is a trivial planner:
-    - It just returns the state unchanged.
+    Uses the index metadata for `state.module_path` to decide what to
+    document and how much to spend:
+    - drop private `_` helpers (by their names in this module, for chunks
+      deduplicated against another file)
+    - order the remaining symbols by importance (call sites, size, query)
+    - keep symbols until PLANNER_MAX_SYMBOLS or PLANNER_TOKEN_BUDGET is hit
+    - size the search `top_k` to the module instead of a fixed 10
 
-    Later you can make this smarter, e.g.:
-    - Decide whether to focus on a specific module region
-    - Filter to public APIs only
-    - Choose different strategies based on `state.query`
+    The plan is stored on `state.plan`; the writer/evaluator agents stop
+    early once its token or latency budget is spent.
     """
+    module_chunks = get_module_chunks(state.module_path)
+    plan = DocPlan(
+        token_budget=PLANNER_TOKEN_BUDGET,
+        latency_budget_s=PLANNER_LATENCY_BUDGET_S,
+        module_indexed=bool(module_chunks),
+    )
+
+    # Canonical chunks defined elsewhere are judged by their names in this
+    # module (their dedup aliases), never by the canonical's own name
+    candidates: List[Tuple[CodeChunk, List[str]]] = []
+    for chunk in module_chunks:
+        names = []
+        for occurrence in module_occurrences(chunk, state.module_path):
+            if is_private_symbol(occurrence.symbol_name):
+                plan.skipped[occurrence.symbol_name] = "private"
+            else:
+                names.append(occurrence.symbol_name)
+        if names:
+            candidates.append((chunk, names))
+
+    def importance(candidate: Tuple[CodeChunk, List[str]]) -> float:
+        chunk, names = candidate
+        return max(
+            symbol_importance(chunk.copy(update={"symbol_name": name}), module_chunks, state.query)
+            for name in names
+        )
+
+    candidates.sort(key=importance, reverse=True)
+
+    for chunk, names in candidates:
+        cost = estimate_symbol_cost(chunk)
+        if len(plan.symbols) >= PLANNER_MAX_SYMBOLS:
+            plan.skipped.update({name: "symbol limit" for name in names})
+        elif plan.estimated_tokens + cost > plan.token_budget and plan.symbols:
+            plan.skipped.update({name: "token budget" for name in names})
+        else:
+            plan.symbols.extend(names)
+            plan.chunk_ids.append(chunk.id)
+            plan.estimated_tokens += cost
+
+    # One doc call and one eval call per planned chunk (aliases share them).
+    # An indexed module with nothing worth documenting gets no calls; an
+    # unindexed one falls back to search, capped at PLANNER_MAX_SYMBOLS.
+    if plan.module_indexed:
+        plan.max_llm_calls = 2 * len(plan.chunk_ids)
+        plan.top_k = min(MAX_TOP_K, max(MIN_TOP_K, 2 * len(module_chunks)))
+    else:
+        plan.max_llm_calls = 2 * PLANNER_MAX_SYMBOLS
+
+    state.plan = plan
+    state.started_at = time.monotonic()
     return state
+
+
+def budget_exhausted(state: DocTaskState) -> bool:
+    """
+    True once the run has spent its planned LLM calls, tokens or time.
+    """
+    plan = state.plan
+    if plan is None:
+        return False
+    if state.llm_calls >= plan.max_llm_calls:
+        return True
+    if plan.token_budget and state.tokens_spent >= plan.token_budget:
+        return True
+    if plan.latency_budget_s and state.started_at is not None:
+        if time.monotonic() - state.started_at >= plan.latency_budget_s:
+            return True
+    return False
+
+
+def record_llm_call(state: DocTaskState, record: LLMCallRecord):
+    """
+    Log one LLM call and add it to the run's spend.
+    """
+    state.llm_call_log.append(record)
+    state.llm_calls += 1
+    state.tokens_spent += record.prompt_tokens + record.response_tokens
+
+
+def planned_symbol_names(state: DocTaskState, chunk: CodeChunk) -> List[str]:
+    """
+    Names under which `chunk` is documented for this run: its planned
+    names in `state.module_path`, or its own name for a fallback search
+    hit from a module that isn't in the index.
+    """
+    occurrences = module_occurrences(chunk, state.module_path)
+    if not occurrences:
+        return [chunk.symbol_name]
+    names = [o.symbol_name for o in occurrences]
+    if state.plan is None:
+        return names
+    return [name for name in names if name in state.plan.symbols]
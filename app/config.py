@@ -8,11 +8,61 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT_DIR / "data"
 REPO_DIR = DATA_DIR / "repo"
 INDEX_DIR = DATA_DIR / "index"
-DOCS_DIR = DATA_DIR / "docs"
+DOCS_DIR = Path(os.getenv("DOCS_DIR", DATA_DIR / "docs"))
 
 EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Embedding backend: "torch" (SentenceTransformer) or "onnx" (int8 ONNX
+# Runtime export from scripts/export_onnx_model.py; falls back to torch
+# when the export is missing)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_DIR = Path(os.getenv("ONNX_MODEL_DIR", DATA_DIR / "models" / "minilm-onnx"))
+ONNX_MODEL_FILE = os.getenv("ONNX_MODEL_FILE", "model_int8.onnx")
+EMBEDDING_MAX_SEQ_LENGTH = 256
+
+# Vector storage in the FAISS index: "float32", "float16" or "int8"
+# (scalar-quantized); only affects newly built indexes
+INDEX_VECTOR_DTYPE = os.getenv("INDEX_VECTOR_DTYPE", "float32")
+
 # Groq config
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 # Pick a good general model – adjust if you like
 GROQ_MODEL_NAME = "llama-3.3-70b-versatile"
+
+# Ingestion dedup: collapse exact duplicate chunks into one canonical
+# chunk per group before embedding
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") != "0"
+# Estimated Jaccard similarity (token shingles) above which two chunks
+# are flagged as near duplicates (never merged); 1.0 disables the pass
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.85"))
+
+# Planner budgets (per pipeline run)
+PLANNER_MAX_SYMBOLS = int(os.getenv("PLANNER_MAX_SYMBOLS", "10"))
+PLANNER_TOKEN_BUDGET = int(os.getenv("PLANNER_TOKEN_BUDGET", "60000"))
+PLANNER_LATENCY_BUDGET_S = float(os.getenv("PLANNER_LATENCY_BUDGET_S", "180"))
+
+# Per-call token budgets enforced by app/tools/prompt_builder.py
+DOC_PROMPT_MAX_TOKENS = int(os.getenv("DOC_PROMPT_MAX_TOKENS", "3000"))
+EVAL_PROMPT_MAX_TOKENS = int(os.getenv("EVAL_PROMPT_MAX_TOKENS", "4000"))
+DOC_RESPONSE_MAX_TOKENS = int(os.getenv("DOC_RESPONSE_MAX_TOKENS", "800"))
+EVAL_RESPONSE_MAX_TOKENS = int(os.getenv("EVAL_RESPONSE_MAX_TOKENS", "200"))
+
+# LLM backend: "groq", "openai" (any OpenAI-compatible HTTP endpoint,
+# e.g. scripts/mock_llm_server.py) or "fake" (in-process, no network)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "groq")
+LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", GROQ_MODEL_NAME)
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "http://127.0.0.1:8765/v1")
+LLM_API_KEY = os.getenv("LLM_API_KEY", "")
+
+# Shared HTTP client, retry and circuit breaker policy
+LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "60"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_S = float(os.getenv("LLM_BACKOFF_BASE_S", "0.5"))
+LLM_BACKOFF_MAX_S = float(os.getenv("LLM_BACKOFF_MAX_S", "20"))
+LLM_CIRCUIT_FAILURES = int(os.getenv("LLM_CIRCUIT_FAILURES", "5"))
+LLM_CIRCUIT_RESET_S = float(os.getenv("LLM_CIRCUIT_RESET_S", "30"))
+
+# Background pipeline jobs (Streamlit frontend)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_HISTORY_LIMIT = int(os.getenv("JOB_HISTORY_LIMIT", "50"))
@@ -2,6 +2,17 @@ from typing import List, Optional, Dict
 from pydantic import BaseModel, Field
 
 
+class ChunkAlias(BaseModel):
+    """
+    Location of a duplicate chunk folded into a canonical CodeChunk.
+    """
+
+    file_path: str
+    symbol_name: str
+    start_line: int
+    end_line: int
+
+
 class CodeChunk(BaseModel):
     id: int
     file_path: str
@@ -10,11 +21,60 @@ class CodeChunk(BaseModel):
     end_line: int
     code: str
 
+    # Set by the ingestion dedup stage: exact copies in the same group share
+    # docs/evaluations, and `aliases` lists the copies this chunk stands for.
+    group_id: Optional[str] = None
+    aliases: List[ChunkAlias] = Field(default_factory=list)
+    # group_id of an earlier, similar (but not identical) chunk; near
+    # duplicates are still indexed and documented on their own
+    near_duplicate_of: Optional[str] = None
+
+
+class LLMCallRecord(BaseModel):
+    """
+    Token accounting for one LLM call (counts from the local estimator).
+    """
+
+    kind: str  # "doc" or "eval"
+    symbol_name: str
+    prompt_tokens: int
+    response_tokens: int
+    condensed: bool = False
+    latency_s: float = 0.0
+
+
+class DocPlan(BaseModel):
+    """
+    Work plan produced by the planner agent for one pipeline run.
+    """
+
+    # Symbols to document, most important first, with their index ids
+    symbols: List[str] = Field(default_factory=list)
+    chunk_ids: List[int] = Field(default_factory=list)
+    # symbol -> reason it was left out ("private", "test file", "budget", ...)
+    skipped: Dict[str, str] = Field(default_factory=dict)
+    # False when the module wasn't found in the index (search falls back
+    # to a plain query instead of using the planned chunks)
+    module_indexed: bool = False
+
+    top_k: int = 10
+    max_llm_calls: int = 20
+    token_budget: int = 0
+    latency_budget_s: float = 0.0
+    estimated_tokens: int = 0
+
 
 class DocTaskState(BaseModel):
     module_path: str
     query: Optional[str] = None
 
+    plan: Optional[DocPlan] = None
+    # Running spend, checked against the plan's budgets by the agents
+    llm_calls: int = 0
+    tokens_spent: int = 0
+    started_at: Optional[float] = None
+    llm_call_log: List[LLMCallRecord] = Field(default_factory=list)
+
     # Use default_factory to avoid mutable default issues
     selected_chunks: List[CodeChunk] = Field(default_factory=list)
     draft_docs: Dict[str, str] = Field(default_factory=dict)
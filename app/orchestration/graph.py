@@ -1,3 +1,5 @@
+from typing import Callable, Optional
+
 from app.models import DocTaskState
 from app.agents.planner_agent import plan_doc_task
 from app.agents.code_search_agent import run_code_search_agent
@@ -7,7 +9,15 @@ from app.tools.doc_writer import generate_module_overview
 from app.tools.file_ops import write_doc_markdown
 
 
-def run_documentation_pipeline(module_path: str, query: str | None = None) -> DocTaskState:
+# Stage names reported to `on_stage`, in execution order
+PIPELINE_STAGES = ["plan", "search", "write_docs", "evaluate", "assemble", "save"]
+
+
+def run_documentation_pipeline(
+    module_path: str,
+    query: str | None = None,
+    on_stage: Optional[Callable[[str], None]] = None,
+) -> DocTaskState:
     """
     End-to-end pipeline:
     - plan
@@ -16,28 +26,41 @@ def run_documentation_pipeline(module_path: str, query: str | None = None) -> Do
     - evaluate docs
     - assemble final markdown
     - write markdown to disk in data/docs/
+
+    `on_stage`, if given, is called with each PIPELINE_STAGES name as
+    that stage starts (used for progress reporting by background jobs).
     """
+    def stage(name: str):
+        if on_stage is not None:
+            on_stage(name)
+
     state = DocTaskState(module_path=module_path, query=query)
 
-    # 1. Planning (currently trivial)
+    # 1. Planning (symbol selection + LLM budget)
+    stage("plan")
     state = plan_doc_task(state)
 
     # 2. Code search (FAISS + embeddings)
+    stage("search")
     state = run_code_search_agent(state)
 
-    # 3. Doc writing (Groq)
+    # 3. Doc writing (LLM backend)
+    stage("write_docs")
     state = run_doc_writer_agent(state)
 
-    # 4. Evaluation (Groq judge)
+    # 4. Evaluation (LLM judge)
+    stage("evaluate")
     state = run_evaluator_agent(state)
 
     # 5. Assemble final markdown
+    stage("assemble")
     state.final_markdown = generate_module_overview(
         module_path=state.module_path,
         docs=state.draft_docs,
     )
 
     # 6. Save to file
+    stage("save")
     out_path = write_doc_markdown(state.module_path, state.final_markdown)
     print(f"[INFO] Wrote docs to: {out_path}")
 
@@ -0,0 +1,136 @@
+"""
+Background execution of documentation pipeline runs.
+
+The Streamlit frontend submits runs here instead of calling
+`run_documentation_pipeline` inline, so the UI never blocks and several
+users' runs execute concurrently on a shared thread pool.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app.config import JOB_HISTORY_LIMIT, JOB_WORKERS
+from app.models import DocTaskState
+from app.orchestration.graph import PIPELINE_STAGES, run_documentation_pipeline
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class PipelineJob:
+    """
+    One pipeline run and its live status; results stay in memory once done.
+    """
+
+    def __init__(self, module_path: str, query: Optional[str]):
+        self.id = uuid.uuid4().hex[:8]
+        self.module_path = module_path
+        self.query = query
+        self.status = QUEUED
+        self.stage: Optional[str] = None
+        self.progress = 0.0
+        self.error: Optional[str] = None
+        self.result: Optional[DocTaskState] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def to_row(self) -> Dict:
+        """
+        Flat summary for the job table.
+        """
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "id": self.id,
+            "module_path": self.module_path,
+            "status": self.status,
+            "stage": self.stage or "",
+            "progress": round(self.progress, 2),
+            "elapsed_s": round(elapsed, 1),
+            "llm_calls": self.result.llm_calls if self.result else None,
+            "error": self.error or "",
+        }
+
+
+class JobManager:
+    """
+    Thread pool + job table for pipeline runs. Safe to share across sessions.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, history_limit: int = JOB_HISTORY_LIMIT):
+        self.history_limit = history_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="doc-pipeline")
+        self._jobs: Dict[str, PipelineJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, module_path: str, query: Optional[str] = None) -> PipelineJob:
+        job = PipelineJob(module_path, query)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job: PipelineJob):
+        job.status = RUNNING
+        job.started_at = time.time()
+
+        def on_stage(name: str):
+            job.stage = name
+            job.progress = PIPELINE_STAGES.index(name) / len(PIPELINE_STAGES)
+
+        try:
+            job.result = run_documentation_pipeline(
+                module_path=job.module_path,
+                query=job.query,
+                on_stage=on_stage,
+            )
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = FAILED
+        else:
+            job.progress = 1.0
+            job.status = DONE
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        # Drop the oldest finished jobs beyond the history limit
+        finished = [j for j in self._jobs.values() if j.finished]
+        excess = len(self._jobs) - self.history_limit
+        for job in sorted(finished, key=lambda j: j.submitted_at)[: max(0, excess)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Optional[PipelineJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[PipelineJob]:
+        """
+        All known jobs, newest first.
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return sorted(jobs, key=lambda j: j.submitted_at, reverse=True)
+
+    def latest_result(self, module_path: str, query: Optional[str] = None) -> Optional[PipelineJob]:
+        """
+        Most recent finished run for the same inputs, if any.
+        """
+        for job in self.list_jobs():
+            if job.status == DONE and job.module_path == module_path and job.query == query:
+                return job
+        return None
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,13 +1,14 @@
 from typing import List, Dict
 from pathlib import Path
 import json
+import threading
 
 import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
-from app.config import INDEX_DIR, EMBEDDING_MODEL_NAME
-from app.models import CodeChunk
+from app.config import INDEX_DIR
+from app.models import ChunkAlias, CodeChunk
+from app.tools.embeddings import get_embedding_model
 
 
 class CodeSearchIndex:
@@ -15,11 +16,13 @@ class CodeSearchIndex:
     Wrapper around a FAISS index + metadata for code chunks.
     """
 
-    def __init__(self, index_dir: Path = INDEX_DIR):
+    def __init__(self, index_dir: Path = INDEX_DIR, model=None):
         self.index_dir = index_dir
         self.index = None
         self.id_to_meta: Dict[int, Dict] = {}
-        self.model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        # Anything with a SentenceTransformer-style `encode` works here
+        self.model = model if model is not None else get_embedding_model()
+        self._load_lock = threading.Lock()
 
     def _load_index_and_meta(self):
         index_path = self.index_dir / "code.index"
@@ -44,8 +47,11 @@ class CodeSearchIndex:
         self.id_to_meta = {i: m for i, m in enumerate(meta_list)}
 
     def ensure_loaded(self):
+        # Several pipeline jobs can share one index, so load it only once
         if self.index is None or not self.id_to_meta:
-            self._load_index_and_meta()
+            with self._load_lock:
+                if self.index is None or not self.id_to_meta:
+                    self._load_index_and_meta()
 
     def search(self, query: str, top_k: int = 5) -> List[CodeChunk]:
         """
@@ -69,17 +75,54 @@ class CodeSearchIndex:
 
         return results
 
+    def chunks_for_module(self, module_path: str) -> List[CodeChunk]:
+        """
+        All indexed chunks defined in `module_path`, including canonical
+        chunks that only appear in the module as a dedup alias.
+        """
+        self.ensure_loaded()
+
+        target = module_path.replace("\\", "/")
+        results: List[CodeChunk] = []
+        for meta in self.id_to_meta.values():
+            paths = [meta["file_path"]]
+            paths.extend(a["file_path"] for a in meta.get("aliases", []))
+            if any(p.replace("\\", "/") == target for p in paths):
+                results.append(CodeChunk(**meta))
+        return results
+
+    def get_chunks(self, ids: List[int]) -> List[CodeChunk]:
+        """
+        Look up chunks by index id, preserving the order of `ids`.
+        """
+        self.ensure_loaded()
+        return [CodeChunk(**self.id_to_meta[i]) for i in ids if i in self.id_to_meta]
+
 
 # Singleton-like helper for agents
 
 _code_search_index: CodeSearchIndex | None = None
+_code_search_index_lock = threading.Lock()
+
+
+def get_code_search_index() -> CodeSearchIndex:
+    """
+    Process-wide index (model + FAISS + metadata), created on first use.
+    """
+    global _code_search_index
+    with _code_search_index_lock:
+        if _code_search_index is None:
+            _code_search_index = CodeSearchIndex()
+        return _code_search_index
 
 
-def _get_index() -> CodeSearchIndex:
+def set_code_search_index(index: CodeSearchIndex):
+    """
+    Swap the process-wide index (benchmarks, alternate index dirs).
+    """
     global _code_search_index
-    if _code_search_index is None:
-        _code_search_index = CodeSearchIndex()
-    return _code_search_index
+    with _code_search_index_lock:
+        _code_search_index = index
 
 
 def search_code(query: str, top_k: int = 5) -> List[CodeChunk]:
@@ -89,5 +132,40 @@ def search_code(query: str, top_k: int = 5) -> List[CodeChunk]:
     Example:
         chunks = search_code("trajectory estimation function", top_k=5)
     """
-    index = _get_index()
+    index = get_code_search_index()
     return index.search(query=query, top_k=top_k)
+
+
+def get_module_chunks(module_path: str) -> List[CodeChunk]:
+    """
+    Public helper: every indexed chunk for a module (used by the planner).
+    """
+    return get_code_search_index().chunks_for_module(module_path)
+
+
+def get_chunks_by_ids(ids: List[int]) -> List[CodeChunk]:
+    """
+    Public helper: chunks for the given index ids, in the given order.
+    """
+    return get_code_search_index().get_chunks(ids)
+
+
+def module_occurrences(chunk: CodeChunk, module_path: str) -> List[ChunkAlias]:
+    """
+    Where `chunk` appears in `module_path`: the chunk itself if it is
+    defined there, plus any of its dedup aliases that live there. A
+    canonical chunk from another file only contributes its local aliases.
+    """
+    target = module_path.replace("\\", "/")
+    occurrences: List[ChunkAlias] = []
+    if chunk.file_path.replace("\\", "/") == target:
+        occurrences.append(
+            ChunkAlias(
+                file_path=chunk.file_path,
+                symbol_name=chunk.symbol_name,
+                start_line=chunk.start_line,
+                end_line=chunk.end_line,
+            )
+        )
+    occurrences.extend(a for a in chunk.aliases if a.file_path.replace("\\", "/") == target)
+    return occurrences
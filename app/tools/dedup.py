@@ -0,0 +1,308 @@
+"""
+Exact and near-duplicate detection for code chunks.
+
+Two passes:
+- exact duplicates: chunks whose normalized AST (docstrings dropped,
+  locally bound identifiers renamed positionally) hashes to the same value
+- near duplicates: MinHash signatures over token shingles, bucketed with
+  LSH and confirmed with an estimated Jaccard similarity threshold
+
+Each exact group keeps one canonical chunk; the others are attached to
+it as aliases so embedding and LLM work only happens once per group.
+Near duplicates may differ in behavior-bearing details (`sum` vs `max`), so
+they keep their own chunk and are only flagged as near copies.
+"""
+
+import ast
+import hashlib
+import io
+import textwrap
+import tokenize
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from app.models import ChunkAlias, CodeChunk
+
+# MinHash / LSH parameters: 8 bands x 8 rows puts the LSH "knee" around
+# a Jaccard similarity of ~0.77, candidates are then verified exactly.
+NUM_PERM = 64
+LSH_BANDS = 8
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_SIZE = 5
+
+# Universal hashing (a*x + b) mod p; with p < 2^31 the products fit in uint64
+_MERSENNE_PRIME = (1 << 31) - 1
+
+_rng = np.random.RandomState(1234)
+_PERM_A = _rng.randint(1, _MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE_PRIME, size=NUM_PERM).astype(np.uint64)
+
+
+class _BoundNames(ast.NodeVisitor):
+    """
+    Collect names bound inside a snippet: def/class names, parameters and
+    assignment, for, with, except and comprehension targets. Names declared
+    `global`/`nonlocal` are excluded since they refer to outer bindings.
+    """
+
+    def __init__(self):
+        self.bound: Set[str] = set()
+        self.outer: Set[str] = set()
+
+    def visit_FunctionDef(self, node):
+        self.bound.add(node.name)
+        self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node):
+        self.visit_FunctionDef(node)
+
+    def visit_ClassDef(self, node):
+        self.bound.add(node.name)
+        self.generic_visit(node)
+
+    def visit_arg(self, node):
+        self.bound.add(node.arg)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, (ast.Store, ast.Del)):
+            self.bound.add(node.id)
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            self.bound.add(node.name)
+        self.generic_visit(node)
+
+    def visit_Global(self, node):
+        self.outer.update(node.names)
+
+    def visit_Nonlocal(self, node):
+        self.outer.update(node.names)
+
+
+class _Normalizer(ast.NodeTransformer):
+    """
+    Strip docstrings and rename locally bound identifiers in order of first
+    appearance, so copies that only differ in naming or docs produce the
+    same dump. Free names (builtins, globals, called helpers) are kept, so
+    `sum(xs)` and `max(xs)` stay distinct.
+    """
+
+    def __init__(self, bound: Set[str]):
+        self.bound = bound
+        self.names: Dict[str, str] = {}
+
+    def _rename(self, name: str) -> str:
+        if name not in self.bound:
+            return name
+        if name not in self.names:
+            self.names[name] = f"_v{len(self.names)}"
+        return self.names[name]
+
+    def _strip_docstring(self, node):
+        body = node.body
+        if (
+            body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            node.body = body[1:] or [ast.Pass()]
+        return node
+
+    def visit_FunctionDef(self, node):
+        node.name = self._rename(node.name)
+        self._strip_docstring(node)
+        return self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node):
+        return self.visit_FunctionDef(node)
+
+    def visit_ClassDef(self, node):
+        node.name = self._rename(node.name)
+        self._strip_docstring(node)
+        return self.generic_visit(node)
+
+    def visit_arg(self, node):
+        node.arg = self._rename(node.arg)
+        node.annotation = None
+        return node
+
+    def visit_Name(self, node):
+        node.id = self._rename(node.id)
+        return node
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            node.name = self._rename(node.name)
+        return self.generic_visit(node)
+
+
+def normalized_ast_hash(code: str) -> str:
+    """
+    Hash of the normalized AST of a code snippet.
+
+    Falls back to hashing whitespace-collapsed source if it doesn't parse.
+    """
+    try:
+        tree = ast.parse(textwrap.dedent(code))
+    except SyntaxError:
+        text = " ".join(code.split())
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    collector = _BoundNames()
+    collector.visit(tree)
+    tree = _Normalizer(collector.bound - collector.outer).visit(tree)
+    dump = ast.dump(tree, annotate_fields=False, include_attributes=False)
+    return hashlib.sha1(dump.encode("utf-8")).hexdigest()
+
+
+def _code_tokens(code: str) -> List[str]:
+    """
+    Lexical tokens with comments, docstring-ish strings and layout dropped.
+    """
+    tokens: List[str] = []
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(textwrap.dedent(code)).readline):
+            if tok.type in (
+                tokenize.COMMENT,
+                tokenize.NL,
+                tokenize.NEWLINE,
+                tokenize.INDENT,
+                tokenize.DEDENT,
+                tokenize.ENDMARKER,
+            ):
+                continue
+            tokens.append(tok.string)
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        tokens = code.split()
+    return tokens
+
+
+def _shingles(tokens: List[str]) -> set:
+    if len(tokens) <= SHINGLE_SIZE:
+        return {" ".join(tokens)}
+    return {
+        " ".join(tokens[i : i + SHINGLE_SIZE])
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signature(code: str) -> np.ndarray:
+    """
+    MinHash signature (NUM_PERM values) over token shingles of `code`.
+    """
+    shingles = _shingles(_code_tokens(code))
+    base_hashes = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+            % _MERSENNE_PRIME
+            for s in shingles
+        ),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    # (NUM_PERM, n_shingles) permuted hashes, min over shingles
+    permuted = (np.outer(_PERM_A, base_hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1)
+
+
+def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    return float(np.mean(sig_a == sig_b))
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            # Keep the lower index as root so the canonical is deterministic
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def dedupe_chunks(
+    chunks: List[CodeChunk],
+    near_dup_threshold: float = 0.85,
+) -> Tuple[List[CodeChunk], Dict]:
+    """
+    Collapse exact duplicates and flag near duplicates.
+
+    Returns (canonical_chunks, stats). Exact copies (same normalized AST)
+    are folded into one canonical chunk that carries a `group_id` and the
+    `aliases` it stands in for. Near duplicates are different code, so
+    they stay separate chunks with their own index entry and docs; they
+    are only flagged via `near_duplicate_of` (the `group_id` of the
+    earliest similar chunk). Chunks are processed in (file_path,
+    start_line) order, so the earliest copy is canonical.
+    """
+    ordered = sorted(chunks, key=lambda c: (c.file_path, c.start_line))
+    n = len(ordered)
+
+    # 1. Exact duplicates via normalized AST hash
+    hashes = [normalized_ast_hash(c.code) for c in ordered]
+    members_by_hash: Dict[str, List[int]] = {}
+    for i, h in enumerate(hashes):
+        members_by_hash.setdefault(h, []).append(i)
+    roots = sorted(members[0] for members in members_by_hash.values())
+
+    # 2. Near duplicates via MinHash + LSH, one rep per exact group
+    near_uf = _UnionFind(n)
+    if near_dup_threshold < 1.0:
+        signatures = {i: minhash_signature(ordered[i].code) for i in roots}
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        for i in roots:
+            sig = signatures[i]
+            for band in range(LSH_BANDS):
+                key = (band, sig[band * LSH_ROWS : (band + 1) * LSH_ROWS].tobytes())
+                buckets.setdefault(key, []).append(i)
+
+        checked = set()
+        for members in buckets.values():
+            for a_pos, a in enumerate(members):
+                for b in members[a_pos + 1 :]:
+                    if (a, b) in checked:
+                        continue
+                    checked.add((a, b))
+                    if near_uf.find(a) == near_uf.find(b):
+                        continue
+                    if estimate_jaccard(signatures[a], signatures[b]) >= near_dup_threshold:
+                        near_uf.union(a, b)
+
+    # 3. One canonical chunk per exact group
+    canonicals: List[CodeChunk] = []
+    near_flagged = 0
+    for root in roots:
+        members = members_by_hash[hashes[root]]
+        canonical = ordered[root].copy(deep=True)
+        canonical.group_id = hashes[root][:16]
+        canonical.aliases = [
+            ChunkAlias(
+                file_path=ordered[i].file_path,
+                symbol_name=ordered[i].symbol_name,
+                start_line=ordered[i].start_line,
+                end_line=ordered[i].end_line,
+            )
+            for i in members[1:]
+        ]
+        near_root = near_uf.find(root)
+        if near_root != root:
+            canonical.near_duplicate_of = hashes[near_root][:16]
+            near_flagged += 1
+        canonicals.append(canonical)
+
+    stats = {
+        "total_chunks": n,
+        "canonical_chunks": len(canonicals),
+        "duplicate_chunks": n - len(canonicals),
+        "exact_duplicates": n - len(canonicals),
+        "near_duplicates": near_flagged,
+    }
+    return canonicals, stats
@@ -1,64 +1,56 @@
-from typing import Dict
-import os
+from typing import Callable, Dict, Optional
+import time
 
-from groq import Groq
+from app.models import CodeChunk, LLMCallRecord
+from app.config import DOC_RESPONSE_MAX_TOKENS
+from app.tools.heuristics import estimate_tokens
+from app.tools.llm_backend import get_llm_backend
+from app.tools.prompt_builder import build_doc_prompt
 
-from app.models import CodeChunk
-from app.config import GROQ_API_KEY, GROQ_MODEL_NAME
 
-# Initialize Groq client once
-client = Groq(api_key=GROQ_API_KEY)
-
-DOC_SYSTEM_PROMPT = (
-    "You are a senior Python library maintainer. "
-    "You write precise, concise API documentation for functions and classes."
-)
-
-DOC_USER_TEMPLATE = """Write documentation for the following Python function or class.
-
-Requirements:
-- Start with a 2–3 line high-level summary.
-- Then add sections: **Parameters**, **Returns**, and **Notes** (if needed).
-- Use clear, concise language.
-- Do NOT change the logic or invent parameters that do not exist.
-
-Return documentation in Markdown format only.
-
-CODE:
-```python
-{code}
-```"""
-
-
-def _chat_with_groq(system_prompt: str, user_prompt: str) -> str:
+def _chat(
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = DOC_RESPONSE_MAX_TOKENS,
+) -> str:
     """
-    Helper to call Groq Chat Completions and return the text content.
+    Helper to call the configured LLM backend and return the text content.
     """
-    if not GROQ_API_KEY:
-        raise RuntimeError(
-            "GROQ_API_KEY is not set. Please add it to your .env file."
-        )
-
-    chat_completion = client.chat.completions.create(
-        model=GROQ_MODEL_NAME,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
+    return get_llm_backend().chat(
+        system_prompt,
+        user_prompt,
         # You can tweak temperature if you want more/less creativity
         temperature=0.2,
+        max_tokens=max_tokens,
     )
 
-    return chat_completion.choices[0].message.content
 
-
-def generate_doc_for_chunk(chunk: CodeChunk) -> str:
+def generate_doc_for_chunk(
+    chunk: CodeChunk,
+    on_call: Optional[Callable[[LLMCallRecord], None]] = None,
+) -> str:
     """
     Generate Markdown documentation for a single function/class CodeChunk
-    using Groq.
+    using the configured LLM backend.
+
+    The prompt is built within DOC_PROMPT_MAX_TOKENS (oversized code is
+    condensed); `on_call`, if given, receives the call's token record.
     """
-    user_prompt = DOC_USER_TEMPLATE.format(code=chunk.code)
-    doc_markdown = _chat_with_groq(DOC_SYSTEM_PROMPT, user_prompt)
+    prompt = build_doc_prompt(chunk)
+
+    started = time.monotonic()
+    doc_markdown = _chat(prompt.system, prompt.user)
+    if on_call is not None:
+        on_call(
+            LLMCallRecord(
+                kind="doc",
+                symbol_name=chunk.symbol_name,
+                prompt_tokens=prompt.prompt_tokens,
+                response_tokens=estimate_tokens(doc_markdown),
+                condensed=prompt.condensed,
+                latency_s=time.monotonic() - started,
+            )
+        )
     return doc_markdown
 
 
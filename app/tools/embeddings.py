@@ -0,0 +1,116 @@
+"""
+Embedding model selection for ingestion and query encoding.
+
+- "torch": SentenceTransformer(EMBEDDING_MODEL_NAME) on PyTorch
+- "onnx":  the same model exported to ONNX with dynamic int8 quantization
+           (scripts/export_onnx_model.py), run with ONNX Runtime on CPU
+
+Both expose the SentenceTransformer-style `encode(texts)` used by
+CodeSearchIndex and scripts/ingest_repo.py. If the ONNX export or
+onnxruntime is missing, or the export fails to load, "onnx" falls back
+to the torch model.
+"""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from app.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MAX_SEQ_LENGTH,
+    EMBEDDING_MODEL_NAME,
+    ONNX_MODEL_DIR,
+    ONNX_MODEL_FILE,
+)
+
+
+class OnnxEmbedder:
+    """
+    Mean-pooled, L2-normalized sentence embeddings from an ONNX export of
+    a BERT-style encoder (matches all-MiniLM-L6-v2's pooling pipeline).
+    """
+
+    def __init__(
+        self,
+        model_dir: Path = ONNX_MODEL_DIR,
+        model_file: str = ONNX_MODEL_FILE,
+        max_seq_length: int = EMBEDDING_MAX_SEQ_LENGTH,
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_dir / model_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, texts, batch_size: int = 32, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Batch similar lengths together to keep padding small
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            batch_ids = order[start : start + batch_size]
+            vectors = self._encode_batch([texts[i] for i in batch_ids])
+            for i, vec in zip(batch_ids, vectors):
+                out[i] = vec
+        return np.asarray(out, dtype=np.float32)
+
+
+def onnx_export_available(model_dir: Path = ONNX_MODEL_DIR, model_file: str = ONNX_MODEL_FILE) -> bool:
+    return (model_dir / model_file).exists() and (model_dir / "tokenizer.json").exists()
+
+
+def get_embedding_model(backend: str = EMBEDDING_BACKEND):
+    """
+    Build the configured embedding model, falling back to torch if the
+    ONNX export (or onnxruntime) isn't available or can't be loaded.
+    """
+    if backend == "onnx":
+        if not onnx_export_available():
+            print(
+                f"[WARN] ONNX export not found in {ONNX_MODEL_DIR}; "
+                "run scripts/export_onnx_model.py. Falling back to torch."
+            )
+        else:
+            try:
+                return OnnxEmbedder()
+            except ImportError as e:
+                print(f"[WARN] ONNX backend unavailable ({e}); falling back to torch.")
+            except Exception as e:
+                # Corrupt/incompatible export: onnxruntime raises its own pybind
+                # errors (InvalidProtobuf, Fail, ...), tokenizers a bare Exception
+                print(f"[WARN] Could not load ONNX export from {ONNX_MODEL_DIR} ({e!r}); falling back to torch.")
+    elif backend != "torch":
+        raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r}; expected 'torch' or 'onnx'")
+
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
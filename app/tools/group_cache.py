@@ -0,0 +1,112 @@
+"""
+Docs and evaluations shared by every copy of a dedup group.
+
+Pipeline runs are per module, so copies of a function that live in
+different files (vendored or copy-pasted code) are documented in
+different runs. The first run to document a group stores its doc and
+scores here, next to the index, and later runs reuse them instead of
+calling the LLM again. Only groups with aliases are cached; a unique
+chunk is regenerated on every run as before.
+
+scripts/ingest_repo.py clears the cache when it rebuilds the index.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.models import CodeChunk
+from app.tools.code_search import get_code_search_index
+
+GROUP_CACHE_FILE = "group_docs.json"
+
+
+def is_shared_group(chunk: CodeChunk) -> bool:
+    """
+    True if `chunk` stands for more than one copy, so its doc is shared.
+    """
+    return bool(chunk.group_id and chunk.aliases)
+
+
+class GroupDocCache:
+    """
+    JSON-backed group_id -> {"doc", "evaluation"} map, safe to share
+    between background pipeline jobs.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: Dict[str, Dict] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with self.path.open("r") as f:
+                    self._entries = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("w") as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get_doc(self, group_id: str) -> Optional[str]:
+        with self._lock:
+            return self._load().get(group_id, {}).get("doc")
+
+    def put_doc(self, group_id: str, doc: str):
+        with self._lock:
+            self._load()[group_id] = {"doc": doc}
+            self._save()
+
+    def get_evaluation(self, group_id: str, doc: str) -> Optional[Dict]:
+        """
+        Stored scores for the group, if they were given to this same doc.
+        """
+        with self._lock:
+            entry = self._load().get(group_id, {})
+            if entry.get("doc") == doc:
+                return entry.get("evaluation")
+            return None
+
+    def put_evaluation(self, group_id: str, doc: str, scores: Dict):
+        with self._lock:
+            entry = self._load().setdefault(group_id, {"doc": doc})
+            if entry.get("doc") == doc:
+                entry["evaluation"] = scores
+                self._save()
+
+
+_group_doc_cache: GroupDocCache | None = None
+_group_doc_cache_lock = threading.Lock()
+
+
+def get_group_doc_cache() -> GroupDocCache:
+    """
+    Cache stored alongside the current code search index.
+    """
+    global _group_doc_cache
+    path = get_code_search_index().index_dir / GROUP_CACHE_FILE
+    with _group_doc_cache_lock:
+        if _group_doc_cache is None or _group_doc_cache.path != path:
+            _group_doc_cache = GroupDocCache(path)
+        return _group_doc_cache
+
+
+def clear_group_doc_cache(index_dir: Path):
+    """
+    Drop cached docs for an index that is being rebuilt.
+    """
+    global _group_doc_cache
+    path = index_dir / GROUP_CACHE_FILE
+    path.unlink(missing_ok=True)
+    with _group_doc_cache_lock:
+        if _group_doc_cache is not None and _group_doc_cache.path == path:
+            _group_doc_cache = None
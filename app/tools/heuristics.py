@@ -0,0 +1,107 @@
+"""
+Cheap, local heuristics used by the planner to size a documentation run.
+"""
+
+import math
+import re
+from pathlib import PurePosixPath
+from typing import List
+
+from app.config import DOC_PROMPT_MAX_TOKENS
+from app.models import CodeChunk
+
+# Rough fixed cost of the doc-writer and evaluator prompts around the code
+DOC_PROMPT_OVERHEAD_TOKENS = 120
+EVAL_PROMPT_OVERHEAD_TOKENS = 220
+# Typical size of a generated doc (doc response, then re-sent to the judge)
+EXPECTED_DOC_TOKENS = 350
+EXPECTED_EVAL_TOKENS = 60
+
+_TOKEN_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]|\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate BPE token count without a tokenizer.
+
+    Words cost one token per ~4 characters, digit runs one per ~3,
+    punctuation and newlines one each; spaces are folded into the
+    following piece. Tends to slightly over-count, which is the safe
+    direction for budgets.
+    """
+    count = 0
+    for piece in _TOKEN_PIECE_RE.findall(text):
+        if piece[0].isalpha():
+            count += math.ceil(len(piece) / 4)
+        elif piece[0].isdigit():
+            count += math.ceil(len(piece) / 3)
+        else:
+            count += 1
+    return max(1, count)
+
+
+def is_private_symbol(name: str) -> bool:
+    """
+    `_helper` and `__mangled` are private; dunders are not, except that
+    only `__init__` is worth documenting among them.
+    """
+    if name.startswith("__") and name.endswith("__"):
+        return name != "__init__"
+    return name.startswith("_")
+
+
+def is_test_file(file_path: str) -> bool:
+    path = PurePosixPath(file_path.replace("\\", "/"))
+    if path.name.startswith("test_") or path.name.endswith("_test.py"):
+        return True
+    return any(part in ("test", "tests") for part in path.parts[:-1])
+
+
+def estimate_symbol_cost(chunk: CodeChunk) -> int:
+    """
+    Estimated tokens for documenting and evaluating one chunk
+    (doc prompt + doc response + eval prompt with code and doc + eval response).
+    """
+    # Prompts never carry more code than the prompt builder allows
+    code_tokens = min(estimate_tokens(chunk.code), DOC_PROMPT_MAX_TOKENS)
+    doc_call = DOC_PROMPT_OVERHEAD_TOKENS + code_tokens + EXPECTED_DOC_TOKENS
+    eval_call = (
+        EVAL_PROMPT_OVERHEAD_TOKENS
+        + code_tokens
+        + EXPECTED_DOC_TOKENS
+        + EXPECTED_EVAL_TOKENS
+    )
+    return doc_call + eval_call
+
+
+def symbol_importance(
+    chunk: CodeChunk,
+    module_chunks: List[CodeChunk],
+    query: str | None = None,
+) -> float:
+    """
+    Importance score for ordering symbols within a module.
+
+    - references from other chunks in the module (call sites) weigh most
+    - larger bodies score higher, with diminishing returns
+    - symbols named in the query get a boost
+    - `__init__` is ranked just behind the public API
+    """
+    call_pattern = re.compile(rf"\b{re.escape(chunk.symbol_name)}\s*\(")
+    references = sum(
+        1
+        for other in module_chunks
+        if other.id != chunk.id and call_pattern.search(other.code)
+    )
+
+    lines = max(1, chunk.end_line - chunk.start_line + 1)
+    score = 2.0 * references + math.log2(1 + lines)
+
+    if query:
+        words = {w.lower() for w in re.findall(r"[A-Za-z]+", query) if len(w) > 2}
+        name_parts = {p.lower() for p in chunk.symbol_name.split("_") if p}
+        score += 3.0 * len(words & name_parts)
+
+    if chunk.symbol_name == "__init__":
+        score -= 1.0
+    return score
@@ -0,0 +1,383 @@
+"""
+Pluggable chat-completion backends shared by the doc writer and evaluator.
+
+Backends:
+- GroqBackend: Groq SDK on top of the shared pooled HTTP client
+- OpenAICompatibleBackend: plain HTTP against any /chat/completions endpoint
+  (OpenAI, Groq's OpenAI-compatible API, scripts/mock_llm_server.py, ...)
+- FakeBackend: in-process canned responses, for offline runs and benchmarks
+
+Every backend goes through `LLMBackend.chat`, which applies a per-call
+timeout, jittered exponential backoff on 429/5xx/transport errors and a
+circuit breaker that fails fast while the upstream is down.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from app.config import (
+    GROQ_API_KEY,
+    LLM_API_KEY,
+    LLM_BACKEND,
+    LLM_BACKOFF_BASE_S,
+    LLM_BACKOFF_MAX_S,
+    LLM_BASE_URL,
+    LLM_CIRCUIT_FAILURES,
+    LLM_CIRCUIT_RESET_S,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_RETRIES,
+    LLM_MODEL_NAME,
+    LLM_TIMEOUT_S,
+)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(RuntimeError):
+    """
+    An LLM call failed (after retries, if the failure was retryable).
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        # status_code None means a timeout / transport error
+        return self.status_code is None or self.status_code in RETRYABLE_STATUS_CODES
+
+
+class CircuitOpenError(LLMError):
+    """
+    Raised without calling upstream while the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls (each one a
+    `chat()` that exhausted its retries), then lets a single trial call
+    through once `reset_timeout_s` has passed.
+    """
+
+    def __init__(self, failure_threshold: int = LLM_CIRCUIT_FAILURES, reset_timeout_s: float = LLM_CIRCUIT_RESET_S):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout_s or self._trial_in_flight:
+                raise CircuitOpenError("LLM circuit breaker is open; skipping call.")
+            # Half-open: let this one call probe the upstream
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """
+        Let a half-open probe go without counting it either way.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+# --- Shared pooled HTTP client ---
+
+_http_client: httpx.Client | None = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Process-wide keep-alive connection pool used by all HTTP backends.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                timeout=httpx.Timeout(LLM_TIMEOUT_S, connect=min(10.0, LLM_TIMEOUT_S)),
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                ),
+            )
+        return _http_client
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class LLMBackend:
+    """
+    Base class: subclasses implement `_complete`, raising LLMError on failure.
+    """
+
+    name = "base"
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL_NAME,
+        timeout_s: float = LLM_TIMEOUT_S,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base_s: float = LLM_BACKOFF_BASE_S,
+        backoff_max_s: float = LLM_BACKOFF_MAX_S,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.model = model
+        self.timeout_s = timeout_s
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+    def _complete(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: Optional[int]) -> str:
+        raise NotImplementedError
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        # "Full jitter" exponential backoff, but never sooner than Retry-After
+        cap = min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt))
+        delay = random.uniform(0, cap)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max_s))
+        return delay
+
+    def chat(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Run one chat completion and return the text content.
+        """
+        # The breaker counts logical calls, not attempts: one failure once
+        # retries are exhausted, and only for retryable/upstream errors
+        self.circuit_breaker.before_call()
+        attempt = 0
+        while True:
+            try:
+                content = self._complete(system_prompt, user_prompt, temperature, max_tokens)
+            except LLMError as e:
+                if not e.retryable:
+                    # Client errors (4xx) say nothing about upstream health
+                    self.circuit_breaker.release_trial()
+                    raise
+                if attempt >= self.max_retries:
+                    self.circuit_breaker.record_failure()
+                    raise
+                time.sleep(self._backoff_delay(attempt, e.retry_after))
+                attempt += 1
+                continue
+            except BaseException:
+                # Unexpected error (SDK validation, bad URL, ...): don't count
+                # it, but never leave a half-open probe stuck in flight
+                self.circuit_breaker.release_trial()
+                raise
+            self.circuit_breaker.record_success()
+            return content
+
+
+class GroqBackend(LLMBackend):
+    name = "groq"
+
+    def __init__(self, api_key: str = GROQ_API_KEY, **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = api_key
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            if not self.api_key:
+                raise LLMError(
+                    "GROQ_API_KEY is not set. Please add it to your .env file.",
+                    status_code=401,
+                )
+            from groq import Groq
+
+            # Retries are handled by LLMBackend.chat, not by the SDK
+            self._client = Groq(
+                api_key=self.api_key,
+                http_client=get_http_client(),
+                max_retries=0,
+                timeout=self.timeout_s,
+            )
+        return self._client
+
+    def _complete(self, system_prompt, user_prompt, temperature, max_tokens):
+        import groq
+
+        client = self._get_client()
+        try:
+            completion = client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        except groq.APIStatusError as e:
+            raise LLMError(
+                f"Groq returned HTTP {e.status_code}: {e.message}",
+                status_code=e.status_code,
+                retry_after=_parse_retry_after(e.response.headers.get("retry-after")),
+            ) from e
+        except (groq.APITimeoutError, groq.APIConnectionError) as e:
+            raise LLMError(f"Groq request failed: {e}") from e
+        return completion.choices[0].message.content
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    name = "openai"
+
+    def __init__(self, base_url: str = LLM_BASE_URL, api_key: str = LLM_API_KEY, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+
+    def _complete(self, system_prompt, user_prompt, temperature, max_tokens):
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": temperature,
+        }
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+        try:
+            response = get_http_client().post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=headers,
+                timeout=self.timeout_s,
+            )
+        except httpx.TransportError as e:
+            # Includes timeouts and connection errors
+            raise LLMError(f"LLM request to {self.base_url} failed: {e!r}") from e
+
+        if response.status_code >= 400:
+            raise LLMError(
+                f"LLM endpoint returned HTTP {response.status_code}: {response.text[:200]}",
+                status_code=response.status_code,
+                retry_after=_parse_retry_after(response.headers.get("retry-after")),
+            )
+        try:
+            return response.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError) as e:
+            raise LLMError(f"Malformed LLM response: {response.text[:200]}", status_code=502) from e
+
+
+def fake_completion(system_prompt: str, user_prompt: str) -> str:
+    """
+    Deterministic canned response for a prompt: JSON scores for evaluator
+    prompts, a short Markdown doc otherwise. Shared with the mock server.
+    """
+    digest = hashlib.sha1((system_prompt + user_prompt).encode("utf-8")).digest()
+    if '"overall_score"' in user_prompt:
+        scores = {
+            "correctness": 3 + digest[0] % 3,
+            "coverage": 3 + digest[1] % 3,
+            "clarity": 3 + digest[2] % 3,
+            "consistency": 3 + digest[3] % 3,
+        }
+        scores["overall_score"] = round(sum(scores.values()) / 4)
+        return json.dumps(scores)
+    return (
+        f"Generated documentation (fake backend, {digest.hex()[:8]}).\n\n"
+        "**Parameters**\n\n- See signature.\n\n"
+        "**Returns**\n\n- See implementation.\n"
+    )
+
+
+class FakeBackend(LLMBackend):
+    """
+    In-process backend with optional simulated latency; never touches the network.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency_s: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency_s = latency_s
+
+    def _complete(self, system_prompt, user_prompt, temperature, max_tokens):
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return fake_completion(system_prompt, user_prompt)
+
+
+_BACKENDS = {
+    GroqBackend.name: GroqBackend,
+    OpenAICompatibleBackend.name: OpenAICompatibleBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+_llm_backend: LLMBackend | None = None
+_llm_backend_lock = threading.Lock()
+
+
+def create_llm_backend(name: str = LLM_BACKEND, **kwargs) -> LLMBackend:
+    try:
+        backend_cls = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown LLM_BACKEND {name!r}; expected one of {sorted(_BACKENDS)}"
+        ) from None
+    return backend_cls(**kwargs)
+
+
+def get_llm_backend() -> LLMBackend:
+    """
+    Process-wide backend selected by LLM_BACKEND.
+    """
+    global _llm_backend
+    with _llm_backend_lock:
+        if _llm_backend is None:
+            _llm_backend = create_llm_backend()
+        return _llm_backend
+
+
+def set_llm_backend(backend: LLMBackend):
+    """
+    Swap the process-wide backend (benchmarks, offline runs).
+    """
+    global _llm_backend
+    with _llm_backend_lock:
+        _llm_backend = backend
@@ -0,0 +1,327 @@
+"""
+Token-budgeted prompt construction for the doc-writer and evaluator calls.
+
+Code that does not fit a call's input budget is condensed structurally
+rather than cut off mid-function:
+1. bodies of the most deeply nested blocks are replaced by an elision
+   marker, working outwards until the code fits
+2. if even top-level block bodies don't fit, runs of plain statements in
+   the function body are elided too, keeping the signature, docstring,
+   block headers and key statements (return / raise / yield)
+3. as a last resort, lines are truncated with a marker
+"""
+
+import ast
+import textwrap
+from typing import List, Tuple
+
+from pydantic import BaseModel
+
+from app.config import DOC_PROMPT_MAX_TOKENS, EVAL_PROMPT_MAX_TOKENS
+from app.models import CodeChunk
+from app.tools.heuristics import estimate_tokens
+
+DOC_SYSTEM_PROMPT = (
+    "You are a senior Python library maintainer. "
+    "You write precise, concise API documentation for functions and classes."
+)
+
+DOC_USER_TEMPLATE = """Write documentation for the following Python function or class.
+
+Requirements:
+- Start with a 2–3 line high-level summary.
+- Then add sections: **Parameters**, **Returns**, and **Notes** (if needed).
+- Use clear, concise language.
+- Do NOT change the logic or invent parameters that do not exist.
+
+Return documentation in Markdown format only.
+
+CODE:
+```python
+{code}
+```"""
+
+# Appended to the user prompt when the code had to be condensed
+CONDENSED_NOTE = (
+    "\n\nNote: the code above was condensed to fit the prompt; lines marked "
+    "`...` were elided. Do not guess at their contents."
+)
+
+EVAL_SYSTEM_PROMPT = (
+    "You are a strict documentation reviewer for Python APIs. "
+    "You score docs based on correctness, coverage, clarity, and consistency "
+    "with the given code."
+)
+
+EVAL_USER_TEMPLATE = (
+    "You are given:\n\n"
+    "1. The Python code for a function or class.\n"
+    "2. The generated documentation in Markdown.\n\n"
+    "Please score the documentation on the following 4 criteria from 1 (poor) to 5 (excellent):\n\n"
+    "- correctness: does it accurately describe the behavior?\n"
+    "- coverage: does it mention key parameters, return value, and side effects?\n"
+    "- clarity: is it easy to understand?\n"
+    "- consistency: does it avoid inventing parameters/behavior not in the code?\n\n"
+    "Respond ONLY as a JSON object with this exact structure:\n\n"
+    "{{\n"
+    '  "correctness": <int 1-5>,\n'
+    '  "coverage": <int 1-5>,\n'
+    '  "clarity": <int 1-5>,\n'
+    '  "consistency": <int 1-5>,\n'
+    '  "overall_score": <int 1-5>\n'
+    "}}\n\n"
+    "CODE:\n"
+    "```python\n"
+    "{code}\n"
+    "```\n\n"
+    "DOC:\n"
+    "```markdown\n"
+    "{doc}\n"
+    "```"
+)
+
+# Never squeeze the code below this many tokens to make room for a doc
+MIN_CODE_TOKENS = 200
+
+
+class BuiltPrompt(BaseModel):
+    system: str
+    user: str
+    prompt_tokens: int
+    condensed: bool = False
+
+
+def _compound_bodies(node: ast.stmt) -> List[List[ast.stmt]]:
+    """
+    Statement lists nested directly under a compound statement.
+    """
+    bodies = []
+    for field in ("body", "orelse", "finalbody"):
+        stmts = getattr(node, field, None)
+        if stmts and isinstance(stmts[0], ast.stmt):
+            bodies.append(stmts)
+    for handler in getattr(node, "handlers", []):
+        bodies.append(handler.body)
+    for case in getattr(node, "cases", []):
+        bodies.append(case.body)
+    return bodies
+
+
+def _is_compound(node: ast.stmt) -> bool:
+    return bool(_compound_bodies(node))
+
+
+def _first_body_stmt(node: ast.stmt) -> ast.stmt:
+    # `match` has no `body`, only `cases`
+    return _compound_bodies(node)[0][0]
+
+
+def _is_docstring(stmt: ast.stmt) -> bool:
+    return (
+        isinstance(stmt, ast.Expr)
+        and isinstance(stmt.value, ast.Constant)
+        and isinstance(stmt.value.value, str)
+    )
+
+
+def _is_key_statement(stmt: ast.stmt) -> bool:
+    """
+    Statements that define a function's contract: returns, raises, yields.
+    """
+    if isinstance(stmt, (ast.Return, ast.Raise)):
+        return True
+    return any(isinstance(node, (ast.Yield, ast.YieldFrom)) for node in ast.walk(stmt))
+
+
+def _max_depth(stmts: List[ast.stmt], depth: int = 0) -> int:
+    deepest = depth
+    for stmt in stmts:
+        for body in _compound_bodies(stmt):
+            deepest = max(deepest, _max_depth(body, depth + 1))
+    return deepest
+
+
+def _first_line(stmt: ast.stmt) -> int:
+    decorators = getattr(stmt, "decorator_list", [])
+    return min([stmt.lineno] + [d.lineno for d in decorators])
+
+
+def _elide_blocks(tree: ast.Module, lines: List[str], min_depth: int) -> str:
+    """
+    Replace the bodies of compound statements at nesting depth >= min_depth
+    (the chunk's own body is depth 1) with a one-line elision marker.
+    """
+    elisions: List[Tuple[int, int]] = []  # 1-based inclusive line ranges
+
+    def visit(stmts: List[ast.stmt], depth: int):
+        for stmt in stmts:
+            if not _is_compound(stmt):
+                continue
+            first = _first_body_stmt(stmt)
+            if depth >= min_depth and first.lineno > stmt.lineno:
+                elisions.append((_first_line(first), stmt.end_lineno))
+            else:
+                for body in _compound_bodies(stmt):
+                    visit(body, depth + 1)
+
+    visit(tree.body, 0)
+    return _apply_elisions(lines, elisions)
+
+
+def _apply_elisions(lines: List[str], elisions: List[Tuple[int, int]]) -> str:
+    out: List[str] = []
+    line_no = 1
+    for start, end in sorted(elisions):
+        out.extend(lines[line_no - 1 : start - 1])
+        first = lines[start - 1]
+        indent = first[: len(first) - len(first.lstrip())]
+        out.append(f"{indent}...  # {end - start + 1} lines elided")
+        line_no = end + 1
+    out.extend(lines[line_no - 1 :])
+    return "\n".join(out)
+
+
+def _key_statements(tree: ast.Module, lines: List[str], max_tokens: int) -> str:
+    """
+    Depth-1 elision, plus runs of plain statements in the top-level
+    definitions' bodies elided largest-first until the code fits; the
+    last run elided keeps as many leading statements as still fit.
+    Signatures, docstrings, block headers and key statements are kept.
+    """
+    blocks: List[Tuple[int, int]] = []
+    runs: List[List[ast.stmt]] = []
+
+    for stmt in tree.body:
+        if not _is_compound(stmt):
+            continue
+        for body in _compound_bodies(stmt):
+            run: List[ast.stmt] = []
+            for pos, child in enumerate(body):
+                if pos == 0 and _is_docstring(child):
+                    continue
+                if _is_compound(child) or _is_key_statement(child):
+                    if run:
+                        runs.append(run)
+                    run = []
+                    first = _first_body_stmt(child) if _is_compound(child) else None
+                    if first is not None and first.lineno > child.lineno:
+                        blocks.append((_first_line(first), child.end_lineno))
+                else:
+                    run.append(child)
+            if run:
+                runs.append(run)
+
+    def elide_tail(run: List[ast.stmt], keep: int) -> Tuple[int, int]:
+        return (_first_line(run[keep]), run[-1].end_lineno)
+
+    elisions = list(blocks)
+    condensed = _apply_elisions(lines, elisions)
+    runs.sort(key=lambda r: r[-1].end_lineno - _first_line(r[0]), reverse=True)
+    for run in runs:
+        if estimate_tokens(condensed) <= max_tokens:
+            break
+        if estimate_tokens(_apply_elisions(lines, elisions + [elide_tail(run, 0)])) <= max_tokens:
+            # Keep the longest prefix of this run that still fits
+            lo, hi = 0, len(run) - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if estimate_tokens(_apply_elisions(lines, elisions + [elide_tail(run, mid)])) <= max_tokens:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            elisions.append(elide_tail(run, lo))
+        else:
+            elisions.append(elide_tail(run, 0))
+        condensed = _apply_elisions(lines, elisions)
+    return condensed
+
+
+def truncate_text(text: str, max_tokens: int, marker: str = "# ... truncated") -> str:
+    """
+    Keep whole leading lines of `text` within `max_tokens`, then a marker.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    budget = max_tokens - estimate_tokens(marker) - 4
+    lines = text.splitlines()
+    kept: List[str] = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    kept.append(f"{marker} ({len(lines) - len(kept)} more lines)")
+    return "\n".join(kept)
+
+
+def condense_code(code: str, max_tokens: int) -> Tuple[str, bool]:
+    """
+    Fit `code` into `max_tokens`, returning (code, was_condensed).
+    """
+    if estimate_tokens(code) <= max_tokens:
+        return code, False
+
+    src = textwrap.dedent(code)
+    try:
+        tree = ast.parse(src)
+    except SyntaxError:
+        return truncate_text(src, max_tokens), True
+
+    lines = src.splitlines()
+    for min_depth in range(_max_depth(tree.body), 0, -1):
+        condensed = _elide_blocks(tree, lines, min_depth)
+        if estimate_tokens(condensed) <= max_tokens:
+            return condensed, True
+
+    condensed = _key_statements(tree, lines, max_tokens)
+    return truncate_text(condensed, max_tokens), True
+
+
+def build_doc_prompt(chunk: CodeChunk, max_tokens: int = DOC_PROMPT_MAX_TOKENS) -> BuiltPrompt:
+    """
+    Doc-writer prompt for `chunk`, within `max_tokens` input tokens.
+    """
+    overhead = (
+        estimate_tokens(DOC_SYSTEM_PROMPT)
+        + estimate_tokens(DOC_USER_TEMPLATE)
+        + estimate_tokens(CONDENSED_NOTE)
+    )
+    code, condensed = condense_code(chunk.code, max(MIN_CODE_TOKENS, max_tokens - overhead))
+
+    user_prompt = DOC_USER_TEMPLATE.format(code=code)
+    if condensed:
+        user_prompt += CONDENSED_NOTE
+    return BuiltPrompt(
+        system=DOC_SYSTEM_PROMPT,
+        user=user_prompt,
+        prompt_tokens=estimate_tokens(DOC_SYSTEM_PROMPT) + estimate_tokens(user_prompt),
+        condensed=condensed,
+    )
+
+
+def build_eval_prompt(code: str, doc: str, max_tokens: int = EVAL_PROMPT_MAX_TOKENS) -> BuiltPrompt:
+    """
+    Evaluator prompt for a code/doc pair, within `max_tokens` input tokens.
+
+    The doc may use at most half of the space left after the template;
+    the code gets the rest (and at least MIN_CODE_TOKENS).
+    """
+    overhead = estimate_tokens(EVAL_SYSTEM_PROMPT) + estimate_tokens(EVAL_USER_TEMPLATE)
+    available = max(2 * MIN_CODE_TOKENS, max_tokens - overhead)
+
+    fitted_doc = truncate_text(doc, available // 2, marker="<!-- truncated -->")
+    code_budget = max(MIN_CODE_TOKENS, available - estimate_tokens(fitted_doc))
+    code, condensed = condense_code(code, code_budget)
+    doc_truncated = fitted_doc != doc
+    doc = fitted_doc
+
+    user_prompt = EVAL_USER_TEMPLATE.format(code=code, doc=doc)
+    return BuiltPrompt(
+        system=EVAL_SYSTEM_PROMPT,
+        user=user_prompt,
+        prompt_tokens=estimate_tokens(EVAL_SYSTEM_PROMPT) + estimate_tokens(user_prompt),
+        condensed=condensed or doc_truncated,
+    )
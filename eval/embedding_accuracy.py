@@ -0,0 +1,157 @@
+"""
+Compare an embedding backend / index storage option against the current
+torch float32 setup on a fixed query set.
+
+Reports, for the corpus of chunks under --repo-dir (default data/repo):
+  - recall@k: overlap of the candidate's top-k with the reference top-k
+  - cosine similarity between reference and candidate query embeddings
+  - per-query encode latency p50/p99 and corpus encode throughput
+  - index size for the reference and candidate storage
+
+Usage:
+    python eval/embedding_accuracy.py --backend onnx --vector-dtype int8
+    python eval/embedding_accuracy.py --backend onnx --min-recall 0.9 --output acc.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+import yaml
+
+# --- Make sure we can import the app package and the ingest script ---
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from app.config import REPO_DIR
+from app.tools.embeddings import OnnxEmbedder, get_embedding_model
+from ingest_repo import build_faiss_index, collect_chunks
+
+
+def load_queries(path: Path) -> list[str]:
+    with path.open("r") as f:
+        queries = yaml.safe_load(f)
+    if not isinstance(queries, list) or not queries:
+        raise ValueError(f"{path} must be a non-empty list of query strings")
+    return [str(q) for q in queries]
+
+
+def encode_queries(model, queries: list[str]):
+    """
+    Encode queries one at a time, as CodeSearchIndex.search does.
+    Returns (embeddings, per-query latencies in seconds).
+    """
+    model.encode(queries[:1])  # warm-up
+    vectors, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        vectors.append(np.asarray(model.encode([query]), dtype="float32")[0])
+        latencies.append(time.perf_counter() - start)
+    return np.vstack(vectors), latencies
+
+
+def profile(model, texts: list[str], queries: list[str], vector_dtype: str, top_k: int) -> dict:
+    start = time.perf_counter()
+    corpus = np.asarray(model.encode(texts), dtype="float32")
+    corpus_s = time.perf_counter() - start
+
+    index = build_faiss_index(corpus, vector_dtype=vector_dtype)
+    query_vectors, latencies = encode_queries(model, queries)
+    _, ids = index.search(query_vectors, top_k)
+
+    latencies_ms = np.asarray(latencies) * 1000.0
+    return {
+        "query_vectors": query_vectors,
+        "ids": ids,
+        "metrics": {
+            "corpus_chunks_per_s": len(texts) / corpus_s,
+            "query_encode_p50_ms": float(np.percentile(latencies_ms, 50)),
+            "query_encode_p99_ms": float(np.percentile(latencies_ms, 99)),
+            "index_bytes": int(faiss.serialize_index(index).nbytes),
+        },
+    }
+
+
+def recall_at_k(reference_ids: np.ndarray, candidate_ids: np.ndarray) -> float:
+    scores = []
+    for ref, cand in zip(reference_ids, candidate_ids):
+        ref_set = {int(i) for i in ref if i >= 0}
+        if ref_set:
+            scores.append(len(ref_set & {int(i) for i in cand}) / len(ref_set))
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["torch", "onnx"], default="onnx")
+    parser.add_argument("--vector-dtype", choices=["float32", "float16", "int8"], default="float32")
+    parser.add_argument("--repo-dir", type=Path, default=REPO_DIR)
+    parser.add_argument("--queries", type=Path, default=CURRENT_DIR / "embedding_queries.yaml")
+    parser.add_argument("--max-chunks", type=int, default=5000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-recall", type=float, default=None, help="Exit 1 if recall@k is below this")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries)
+    chunks, _ = collect_chunks(args.repo_dir, verbose=False)
+    if not chunks:
+        raise SystemExit(f"No code chunks found under {args.repo_dir}")
+    texts = [c.code for c in chunks[: args.max_chunks]]
+    print(f"[INFO] {len(texts)} chunks, {len(queries)} queries, top_k={args.top_k}")
+
+    reference_model = get_embedding_model("torch")
+    candidate_model = get_embedding_model(args.backend)
+    if args.backend == "onnx" and not isinstance(candidate_model, OnnxEmbedder):
+        print("[WARN] Candidate fell back to torch; results compare torch against itself.")
+
+    reference = profile(reference_model, texts, queries, "float32", args.top_k)
+    candidate = profile(candidate_model, texts, queries, args.vector_dtype, args.top_k)
+
+    cosines = np.sum(reference["query_vectors"] * candidate["query_vectors"], axis=1) / (
+        np.linalg.norm(reference["query_vectors"], axis=1)
+        * np.linalg.norm(candidate["query_vectors"], axis=1)
+    )
+    recall = recall_at_k(reference["ids"], candidate["ids"])
+
+    results = {
+        "config": {
+            "backend": args.backend,
+            "vector_dtype": args.vector_dtype,
+            "chunks": len(texts),
+            "queries": len(queries),
+            "top_k": args.top_k,
+        },
+        "recall_at_k": recall,
+        "query_cosine_mean": float(cosines.mean()),
+        "query_cosine_min": float(cosines.min()),
+        "reference": reference["metrics"],
+        "candidate": candidate["metrics"],
+    }
+
+    print("\n==================== EMBEDDING ACCURACY vs SPEED ====================")
+    print(f"recall@{args.top_k:<3d}          : {recall:.3f}")
+    print(f"query cosine mean/min: {cosines.mean():.4f} / {cosines.min():.4f}")
+    for name in reference["metrics"]:
+        ref, cand = reference["metrics"][name], candidate["metrics"][name]
+        print(f"{name:22s}: {ref:12.4g} -> {cand:12.4g}  ({cand / ref:.2f}x)")
+
+    if args.output is not None:
+        with args.output.open("w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[INFO] Wrote results to {args.output}")
+
+    if args.min_recall is not None and recall < args.min_recall:
+        print(f"[FAIL] recall@{args.top_k} {recall:.3f} is below {args.min_recall}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Performance benchmark for ingestion, retrieval and the end-to-end pipeline.
+
+Unlike eval/run_benchmark.py (LLM-judge quality), this measures speed and
+size on a synthetic repo and needs no network:
+  - ingestion throughput (files/s, chunks/s) and dedup time
+  - embedding throughput and FAISS index build time
+  - index + metadata size on disk, peak RSS
+  - query latency p50/p99 through CodeSearchIndex.search
+  - end-to-end pipeline latency p50/p99 with the in-process FakeBackend
+
+Results are written as JSON. With --compare, the run fails (exit code 1)
+when any metric is worse than the baseline by more than --threshold.
+
+Usage:
+    python eval/perf_benchmark.py --functions 10000 --output bench.json
+    python eval/perf_benchmark.py --functions 10000 --compare bench.json --threshold 0.15
+
+`--embedder hash` (default) uses a deterministic feature-hashing embedder so
+large repos (up to ~1M functions) stay tractable; `--embedder torch` /
+`--embedder onnx` measure the production encode paths, and `--vector-dtype`
+selects float32 / float16 / int8 index storage.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# --- Make sure we can import the app package and the ingest script ---
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+for path in (PROJECT_ROOT, PROJECT_ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# Keep benchmark docs out of data/docs
+os.environ.setdefault("DOCS_DIR", str(Path(tempfile.gettempdir()) / "perf_bench_docs"))
+
+from app.orchestration.graph import run_documentation_pipeline
+from app.tools.code_search import CodeSearchIndex, set_code_search_index
+from app.tools.dedup import dedupe_chunks
+from app.tools.embeddings import get_embedding_model
+from app.tools.llm_backend import FakeBackend, set_llm_backend
+from ingest_repo import build_faiss_index, collect_chunks, embed_chunks, write_index
+from synthetic_repo import WORDS, generate_repo
+
+# Direction in which each metric improves; used by --compare
+METRIC_DIRECTIONS = {
+    "ingest_files_per_s": "higher",
+    "ingest_chunks_per_s": "higher",
+    "dedup_s": "lower",
+    "embed_chunks_per_s": "higher",
+    "index_build_s": "lower",
+    "index_load_s": "lower",
+    "index_bytes": "lower",
+    "metadata_bytes": "lower",
+    "query_p50_ms": "lower",
+    "query_p99_ms": "lower",
+    "pipeline_p50_ms": "lower",
+    "pipeline_p99_ms": "lower",
+    "peak_rss_mb": "lower",
+}
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-tokens embedder with the SentenceTransformer
+    `encode` signature; cheap enough for million-function repos.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def encode(self, texts, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype="float32")
+        for row, text in enumerate(texts):
+            for token in re.findall(r"[A-Za-z_]+", text.lower()):
+                h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+                out[row, h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.maximum(norms, 1e-12)
+
+
+def percentile_ms(samples_s, q: float) -> float:
+    return float(np.percentile(np.asarray(samples_s) * 1000.0, q))
+
+
+def make_queries(n: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [f"{rng.choice(WORDS)} {rng.choice(WORDS)} function" for _ in range(n)]
+
+
+def run_benchmark(args) -> dict:
+    if args.workdir is not None:
+        return _run_benchmark(args, args.workdir)
+    # A 1M-function repo + index is several GB; don't leave it in /tmp
+    workdir = Path(tempfile.mkdtemp(prefix="perf_bench_"))
+    try:
+        return _run_benchmark(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_benchmark(args, workdir: Path) -> dict:
+    repo_dir = workdir / "repo"
+    index_dir = workdir / "index"
+    metrics = {}
+
+    print(f"[INFO] Generating {args.functions} functions under {repo_dir}")
+    repo = generate_repo(
+        repo_dir,
+        args.functions,
+        functions_per_file=args.functions_per_file,
+        duplicate_ratio=args.duplicate_ratio,
+        seed=args.seed,
+    )
+
+    # --- Ingestion ---
+    start = time.perf_counter()
+    chunks, n_files = collect_chunks(repo_dir, verbose=False)
+    ingest_s = time.perf_counter() - start
+    metrics["ingest_files_per_s"] = n_files / ingest_s
+    metrics["ingest_chunks_per_s"] = len(chunks) / ingest_s
+
+    start = time.perf_counter()
+    chunks, dedup_stats = dedupe_chunks(chunks)
+    metrics["dedup_s"] = time.perf_counter() - start
+    metrics["canonical_chunks"] = dedup_stats["canonical_chunks"]
+
+    # --- Embedding + index build ---
+    if args.embedder == "hash":
+        model = HashingEmbedder()
+    else:
+        model = get_embedding_model(args.embedder)
+
+    start = time.perf_counter()
+    embeddings = embed_chunks(chunks, model, show_progress_bar=False)
+    metrics["embed_chunks_per_s"] = len(chunks) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    index = build_faiss_index(embeddings, vector_dtype=args.vector_dtype)
+    index_path, meta_path = write_index(index, chunks, index_dir)
+    metrics["index_build_s"] = time.perf_counter() - start
+    metrics["index_bytes"] = index_path.stat().st_size
+    metrics["metadata_bytes"] = meta_path.stat().st_size
+    del embeddings, index, chunks
+
+    # --- Query latency ---
+    search_index = CodeSearchIndex(index_dir=index_dir, model=model)
+    start = time.perf_counter()
+    search_index.ensure_loaded()
+    metrics["index_load_s"] = time.perf_counter() - start
+
+    queries = make_queries(args.queries, args.seed)
+    for query in queries[:5]:  # warm-up
+        search_index.search(query, top_k=args.top_k)
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search_index.search(query, top_k=args.top_k)
+        latencies.append(time.perf_counter() - start)
+    metrics["query_p50_ms"] = percentile_ms(latencies, 50)
+    metrics["query_p99_ms"] = percentile_ms(latencies, 99)
+
+    # --- End-to-end pipeline with a mocked LLM ---
+    if args.pipeline_runs > 0:
+        set_code_search_index(search_index)
+        set_llm_backend(FakeBackend(latency_s=args.llm_latency_ms / 1000.0))
+
+        rng = random.Random(args.seed)
+        modules = rng.sample(repo["module_paths"], min(args.pipeline_runs, len(repo["module_paths"])))
+        latencies = []
+        for module_path in modules:
+            start = time.perf_counter()
+            run_documentation_pipeline(module_path)
+            latencies.append(time.perf_counter() - start)
+        metrics["pipeline_p50_ms"] = percentile_ms(latencies, 50)
+        metrics["pipeline_p99_ms"] = percentile_ms(latencies, 99)
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    metrics["peak_rss_mb"] = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+    return {
+        "config": {
+            "functions": args.functions,
+            "files": repo["files"],
+            "functions_per_file": args.functions_per_file,
+            "duplicate_ratio": args.duplicate_ratio,
+            "embedder": args.embedder,
+            "vector_dtype": args.vector_dtype,
+            "queries": args.queries,
+            "top_k": args.top_k,
+            "pipeline_runs": args.pipeline_runs,
+            "llm_latency_ms": args.llm_latency_ms,
+            "seed": args.seed,
+        },
+        "metrics": metrics,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Return a description of every metric that regressed past `threshold`
+    (relative change) against the baseline.
+    """
+    regressions = []
+    for name, direction in METRIC_DIRECTIONS.items():
+        old = baseline.get("metrics", {}).get(name)
+        new = current.get("metrics", {}).get(name)
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or old == 0:
+            continue
+        change = (new - old) / abs(old)
+        worse = -change if direction == "higher" else change
+        if worse > threshold:
+            regressions.append(
+                f"{name}: {old:.4g} -> {new:.4g} ({change:+.1%}, {direction} is better)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--functions", type=int, default=1000, help="Functions in the synthetic repo")
+    parser.add_argument("--functions-per-file", type=int, default=20)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05)
+    parser.add_argument("--embedder", choices=["hash", "torch", "onnx"], default="hash")
+    parser.add_argument("--vector-dtype", choices=["float32", "float16", "int8"], default="float32")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--pipeline-runs", type=int, default=20, help="0 skips the pipeline stage")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated latency per LLM call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workdir", type=Path, default=None,
+        help="Where to put the repo/index (default: a temp dir, removed afterwards)",
+    )
+    parser.add_argument("--output", type=Path, default=Path("perf_results.json"))
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    # Read the baseline first: --output may point at the same file
+    baseline = None
+    if args.compare is not None:
+        with args.compare.open("r") as f:
+            baseline = json.load(f)
+
+    results = run_benchmark(args)
+
+    with args.output.open("w") as f:
+        json.dump(results, f, indent=2)
+    print(f"[INFO] Wrote results to {args.output}")
+
+    print("\n==================== PERFORMANCE ====================")
+    for name, value in results["metrics"].items():
+        print(f"{name:22s}: {value:.4g}")
+
+    if baseline is not None:
+        if baseline.get("config") != results["config"]:
+            print("[WARN] Baseline was run with a different config; comparison may be meaningless.")
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n[FAIL] {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\n[OK] No metric regressed by more than {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
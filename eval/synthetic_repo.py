@@ -0,0 +1,187 @@
+"""
+Generate synthetic Python repos of configurable size for performance benchmarks.
+
+Functions are built from random combinations of body blocks (loops,
+branches, try/except, with, nested blocks) with seeded random names and
+constants, so the same arguments always produce the same repo. A fraction of functions are
+verbatim or renamed copies, and some are `_private`, so the dedup and
+planner paths see realistic input.
+
+Usage:
+    python eval/synthetic_repo.py /tmp/synth_repo --functions 10000
+"""
+
+import argparse
+import random
+from pathlib import Path
+from typing import List
+
+WORDS = [
+    "load", "parse", "compute", "update", "build", "merge", "filter", "score",
+    "track", "predict", "normalize", "encode", "decode", "split", "sample",
+    "window", "batch", "feature", "sequence", "matrix", "record", "event",
+    "config", "cache", "index", "token", "signal", "frame", "vector", "graph",
+]
+
+# Body blocks; {x}/{y}/{z} are local names, {a}/{b} parameters, {k} constants
+BLOCKS = [
+    """    {x} = []
+    for {y} in {a}:
+        if {y} is None:
+            continue
+        {x}.append({y} * {k})
+""",
+    """    {x} = 0
+    for {y}, {z} in enumerate({a}):
+        if {y} % {k} == 0:
+            {x} += {z}
+        elif {z} < 0:
+            {x} -= {z} * {b}
+""",
+    """    try:
+        {x} = dict({a})
+    except (TypeError, ValueError):
+        {x} = {{}}
+""",
+    """    {x} = [[0] * {k} for _ in range({k})]
+    for {y} in range({k}):
+        {x}[{y}][{y}] = {b}
+""",
+    """    {x} = []
+    {z} = {{"count": 0, "sum": 0}}
+    for {y} in {a}:
+        {x}.append({y})
+        if len({x}) > {k}:
+            {x}.pop(0)
+        {z}["count"] += 1
+""",
+    """    if {b} is None:
+        raise ValueError("{x} requires {b}")
+""",
+    """    {x} = sorted({a}, key=lambda {y}: ({y} % {k}, -{y}))
+""",
+    """    with open({b}) as {y}:
+        {x} = [line.strip() for line in {y} if line.strip()]
+""",
+    """    {x} = {{}}
+    for {y} in {a}:
+        {x}.setdefault({y} % {k}, []).append({y})
+""",
+    """    while {b} > {k}:
+        {b} = {b} // 2
+""",
+]
+
+
+def _name(rng: random.Random, used: set) -> str:
+    name = "_".join(rng.sample(WORDS, rng.choice([2, 3])))
+    if name in used:
+        # The word pool only has ~25k combinations; number the rest
+        name = f"{name}_{len(used)}"
+    used.add(name)
+    return name
+
+
+def _local(rng: random.Random) -> str:
+    return "_".join(rng.sample(WORDS, 2))
+
+
+def generate_function(rng: random.Random, used_names: set, private: bool = False) -> str:
+    """
+    A function built from 2-5 random body blocks with random names/constants.
+    """
+    name = _name(rng, used_names)
+    if private:
+        name = "_" + name
+    a, b = _local(rng), _local(rng)
+
+    lines = [f"def {name}({a}, {b}=None):"]
+    if rng.random() < 0.6:
+        lines.append(f'    """{name.strip("_").replace("_", " ").capitalize()} helper."""')
+
+    results = []
+    for block in rng.sample(BLOCKS, rng.randint(2, 5)):
+        x = _local(rng)
+        body = block.format(x=x, y=_local(rng), z=_local(rng), a=a, b=b, k=rng.randint(2, 99))
+        lines.append(body.rstrip("\n"))
+        if f"{x} = " in body:
+            results.append(x)
+    lines.append(f"    return ({', '.join(results or [b])},)")
+    return "\n".join(lines) + "\n"
+
+
+def generate_repo(
+    out_dir: Path,
+    n_functions: int,
+    functions_per_file: int = 20,
+    files_per_package: int = 100,
+    duplicate_ratio: float = 0.05,
+    private_ratio: float = 0.2,
+    seed: int = 0,
+) -> dict:
+    """
+    Write a synthetic repo under `out_dir` and return a summary dict.
+    """
+    rng = random.Random(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    used_names: set = set()
+    generated: List[str] = []
+    n_files = 0
+    module_paths: List[str] = []
+
+    remaining = n_functions
+    while remaining > 0:
+        package = out_dir / f"pkg_{n_files // files_per_package:04d}"
+        package.mkdir(exist_ok=True)
+        module = package / f"module_{n_files % files_per_package:03d}.py"
+
+        functions = []
+        for _ in range(min(functions_per_file, remaining)):
+            if generated and rng.random() < duplicate_ratio:
+                # Copy-pasted helper, sometimes renamed
+                src = rng.choice(generated)
+                if rng.random() < 0.5:
+                    old = src.split("(", 1)[0][len("def "):]
+                    src = src.replace(f"def {old}(", f"def {_name(rng, used_names)}(", 1)
+                functions.append(src)
+            else:
+                src = generate_function(rng, used_names, private=rng.random() < private_ratio)
+                functions.append(src)
+                if len(generated) < 1000:
+                    generated.append(src)
+
+        module.write_text("\n\n".join(functions))
+        module_paths.append(str(module.relative_to(out_dir)))
+        remaining -= len(functions)
+        n_files += 1
+
+    return {
+        "repo_dir": str(out_dir),
+        "functions": n_functions,
+        "files": n_files,
+        "module_paths": module_paths,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--functions", type=int, default=1000)
+    parser.add_argument("--functions-per-file", type=int, default=20)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    summary = generate_repo(
+        args.out_dir,
+        args.functions,
+        functions_per_file=args.functions_per_file,
+        duplicate_ratio=args.duplicate_ratio,
+        seed=args.seed,
+    )
+    print(f"[INFO] Wrote {summary['functions']} functions in {summary['files']} files to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,17 +19,92 @@ PROJECT_ROOT = CURRENT_DIR.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app.orchestration.graph import run_documentation_pipeline
-from app.config import DOCS_DIR
+from app.config import JOB_WORKERS
+from app.orchestration.jobs import FAILED, JobManager, PipelineJob
+from app.tools.code_search import CodeSearchIndex, get_code_search_index
 
+# How often the job table refreshes while jobs are running
+JOB_REFRESH_S = 2
 
-def get_doc_path(module_path: str) -> Path:
+
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """
+    One background executor + job table shared by every session.
+    """
+    return JobManager(max_workers=JOB_WORKERS)
+
+
+@st.cache_resource
+def load_search_index() -> CodeSearchIndex:
     """
-    Reconstruct the markdown doc path the same way the backend does:
-    replace slashes in module_path with underscores and append .md.
+    Load the embedding model and FAISS index once per server process,
+    so the first job of every session doesn't pay for it.
     """
-    safe_name = module_path.replace("/", "_")
-    return DOCS_DIR / f"{safe_name}.md"
+    index = get_code_search_index()
+    index.ensure_loaded()
+    return index
+
+
+def _auto_refresh(fn):
+    # st.fragment reruns just this part of the page; older Streamlit
+    # versions fall back to refreshing on the next interaction.
+    fragment = getattr(st, "fragment", None)
+    if fragment is None:
+        return fn
+    return fragment(run_every=JOB_REFRESH_S)(fn)
+
+
+def show_job_result(job: PipelineJob):
+    """
+    Render a finished job from the in-memory job store.
+    """
+    if job.status == FAILED:
+        st.error(f"Pipeline failed: {job.error}")
+        return
+
+    state = job.result
+    st.success(f"Pipeline finished for `{job.module_path}`.")
+
+    # --- Show documentation ---
+    st.subheader("Generated documentation")
+    if state.final_markdown:
+        st.markdown(state.final_markdown)
+    else:
+        st.write("No documentation content available.")
+
+    # --- Show evaluation scores ---
+    st.subheader("Evaluation scores (LLM as judge)")
+
+    evaluations = getattr(state, "evaluations", {}) or {}
+    if not evaluations:
+        st.write("No evaluations were returned by the pipeline.")
+    else:
+        for symbol, scores in evaluations.items():
+            st.markdown(f"**Function or symbol:** `{symbol}`")
+            st.json(scores)
+
+
+@_auto_refresh
+def render_jobs(manager: JobManager):
+    jobs = manager.list_jobs()
+    st.subheader("Jobs")
+    if not jobs:
+        st.info("Enter a module path in the sidebar and click 'Run pipeline'.")
+        return
+
+    st.dataframe([job.to_row() for job in jobs], use_container_width=True)
+
+    selected_id = st.session_state.get("selected_job")
+    job = manager.get(selected_id) if selected_id else None
+    if job is None:
+        return
+
+    if not job.finished:
+        st.info(f"Running documentation pipeline for `{job.module_path}`...")
+        st.progress(job.progress, text=f"Stage: {job.stage or 'queued'}")
+    else:
+        show_job_result(job)
 
 
 def main():
@@ -48,10 +123,18 @@ under `data/repo/`.
 **Steps:**
 1. Put your GitHub repo or local project under `data/repo/`.
 2. Run `python scripts/ingest_repo.py` to build the index.
-3. Enter the module path below and click “Run pipeline”.
+3. Enter the module path below and click “Run pipeline”. Runs execute in the
+   background, so you can queue several and watch their progress below.
         """
     )
 
+    try:
+        load_search_index()
+    except FileNotFoundError as e:
+        st.warning(str(e))
+
+    manager = get_job_manager()
+
     st.sidebar.header("Pipeline inputs")
 
     default_module = (
@@ -71,6 +154,11 @@ under `data/repo/`.
         help="Optional hint about what kind of functionality is most important.",
     )
 
+    reuse = st.sidebar.checkbox(
+        "Reuse latest finished result for the same inputs",
+        value=True,
+    )
+
     run_button = st.sidebar.button("Run pipeline")
 
     if run_button:
@@ -78,55 +166,25 @@ under `data/repo/`.
             st.error("Please enter a module path.")
             return
 
-        st.info(f"Running documentation pipeline for `{module_path}`...")
-        with st.spinner("Thinking, searching, and writing docs..."):
-            try:
-                state = run_documentation_pipeline(
-                    module_path=module_path,
-                    query=query or None,
-                )
-            except Exception as e:
-                st.error(f"Pipeline failed: {e}")
-                return
-
-        st.success("Pipeline finished.")
-
-        # --- Show documentation ---
-        doc_path = get_doc_path(module_path)
-        st.subheader("Generated documentation")
-
-        if doc_path.exists():
-            try:
-                doc_text = doc_path.read_text()
-            except Exception as e:
-                st.error(f"Could not read documentation file: {e}")
-                doc_text = ""
-        else:
-            st.warning(
-                f"Expected documentation at `{doc_path}`, but file does not exist. "
-                "Showing nothing for now."
-            )
-            doc_text = ""
-
-        if doc_text:
-            st.markdown(doc_text)
-        else:
-            st.write("No documentation content available.")
-
-        # --- Show evaluation scores ---
-        st.subheader("Evaluation scores (LLM as judge)")
-
-        evaluations = getattr(state, "evaluations", {}) or {}
-        if not evaluations:
-            st.write("No evaluations were returned by the pipeline.")
-        else:
-            for symbol, scores in evaluations.items():
-                st.markdown(f"**Function or symbol:** `{symbol}`")
-                st.json(scores)
-    else:
-        st.info("Enter a module path in the sidebar and click 'Run pipeline'.")
+        previous = manager.latest_result(module_path, query or None) if reuse else None
+        job = previous or manager.submit(module_path, query or None)
+        st.session_state["selected_job"] = job.id
+
+    jobs = manager.list_jobs()
+    if jobs:
+        labels = {j.id: f"{j.id} · {j.module_path} · {j.status}" for j in jobs}
+        options = list(labels)
+        current = st.session_state.get("selected_job")
+        choice = st.sidebar.selectbox(
+            "Show job",
+            options,
+            index=options.index(current) if current in options else 0,
+            format_func=labels.get,
+        )
+        st.session_state["selected_job"] = choice
+
+    render_jobs(manager)
 
 
 if __name__ == "__main__":
     main()
-
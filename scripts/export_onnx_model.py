@@ -0,0 +1,120 @@
+"""
+Export the embedding model to ONNX and quantize it to int8 for CPU serving.
+
+Writes to ONNX_MODEL_DIR (default data/models/minilm-onnx/):
+  - model.onnx        float32 export of the transformer encoder
+  - model_int8.onnx   dynamic int8 quantization (weights int8, activations
+                      quantized at runtime); used by EMBEDDING_BACKEND=onnx
+  - tokenizer.json    fast tokenizer for the ONNX embedder
+
+Usage:
+    python scripts/export_onnx_model.py
+    EMBEDDING_BACKEND=onnx python scripts/ingest_repo.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# --- Make sure the project root is on sys.path ---
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.config import EMBEDDING_MODEL_NAME, ONNX_MODEL_DIR, ONNX_MODEL_FILE
+from app.tools.embeddings import OnnxEmbedder
+
+SANITY_TEXTS = [
+    "def load_data(path): return pd.read_csv(path)",
+    "function that creates sequences for time series prediction",
+    "class Tracker:\n    def update(self, detections): ...",
+]
+
+
+def export_onnx(out_dir: Path) -> Path:
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    class TokenEmbeddings(torch.nn.Module):
+        # Return only last_hidden_state so the graph has a single plain output
+        def __init__(self, encoder):
+            super().__init__()
+            self.encoder = encoder
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            outputs = self.encoder(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids,
+            )
+            return outputs[0]
+
+    tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_MODEL_NAME)
+    model = TokenEmbeddings(AutoModel.from_pretrained(EMBEDDING_MODEL_NAME))
+    model.eval()
+
+    dummy = tokenizer(SANITY_TEXTS, padding=True, return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    onnx_path = out_dir / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(dummy[name] for name in input_names),
+            str(onnx_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            # TorchScript exporter: honours dynamic_axes, no onnxscript needed
+            dynamo=False,
+        )
+
+    tokenizer.save_pretrained(str(out_dir))
+    return onnx_path
+
+
+def quantize(onnx_path: Path, out_path: Path):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(onnx_path), str(out_path), weight_type=QuantType.QInt8)
+
+
+def sanity_check(out_dir: Path):
+    """
+    Cosine similarity between torch and int8 ONNX embeddings on a few texts.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    reference = SentenceTransformer(EMBEDDING_MODEL_NAME).encode(SANITY_TEXTS, normalize_embeddings=True)
+    candidate = OnnxEmbedder(model_dir=out_dir).encode(SANITY_TEXTS)
+    cosines = np.sum(reference * candidate, axis=1)
+    print(f"[INFO] torch vs int8 ONNX cosine: min={cosines.min():.4f} mean={cosines.mean():.4f}")
+    if cosines.min() < 0.95:
+        print("[WARN] Quantized embeddings drift noticeably; check eval/embedding_accuracy.py before serving.")
+
+
+def main():
+    out_dir = ONNX_MODEL_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"[INFO] Exporting {EMBEDDING_MODEL_NAME} to {out_dir}")
+    onnx_path = export_onnx(out_dir)
+
+    quantized_path = out_dir / ONNX_MODEL_FILE
+    quantize(onnx_path, quantized_path)
+    print(
+        f"[INFO] Wrote {onnx_path.name} ({onnx_path.stat().st_size / 1e6:.1f} MB) and "
+        f"{quantized_path.name} ({quantized_path.stat().st_size / 1e6:.1f} MB)"
+    )
+
+    sanity_check(out_dir)
+
+
+if __name__ == "__main__":
+    main()
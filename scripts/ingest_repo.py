@@ -13,7 +13,6 @@ import ast
 
 import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
 # --- Make sure the project root is on sys.path ---
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -21,11 +20,27 @@ PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from app.config import REPO_DIR, INDEX_DIR, EMBEDDING_MODEL_NAME
+from app.config import (
+    REPO_DIR,
+    INDEX_DIR,
+    DEDUP_ENABLED,
+    NEAR_DUP_THRESHOLD,
+    INDEX_VECTOR_DTYPE,
+)
 from app.models import CodeChunk
+from app.tools.dedup import dedupe_chunks
+from app.tools.embeddings import get_embedding_model
+from app.tools.group_cache import clear_group_doc_cache
 
+# FAISS scalar quantizers for the reduced-precision storage options
+SCALAR_QUANTIZERS = {
+    "float16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+BYTES_PER_DIM = {"float32": 4, "float16": 2, "int8": 1}
 
-def extract_chunks_from_file(path: Path) -> list[CodeChunk]:
+
+def extract_chunks_from_file(path: Path, repo_dir: Path = REPO_DIR) -> list[CodeChunk]:
     """
     Very simple function-level chunking:
     - Each top-level function (ast.FunctionDef) becomes a CodeChunk.
@@ -51,7 +66,7 @@ def extract_chunks_from_file(path: Path) -> list[CodeChunk]:
             chunks.append(
                 CodeChunk(
                     id=-1,  # will be filled later
-                    file_path=str(path.relative_to(REPO_DIR)),
+                    file_path=str(path.relative_to(repo_dir)),
                     symbol_name=node.name,
                     start_line=start,
                     end_line=end,
@@ -61,53 +76,140 @@ def extract_chunks_from_file(path: Path) -> list[CodeChunk]:
     return chunks
 
 
-def main():
-    print(f"[INFO] REPO_DIR = {REPO_DIR}")
-    print(f"[INFO] INDEX_DIR = {INDEX_DIR}")
-
-    INDEX_DIR.mkdir(parents=True, exist_ok=True)
-
-    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
-
+def collect_chunks(repo_dir: Path = REPO_DIR, verbose: bool = True) -> tuple[list[CodeChunk], int]:
+    """
+    Extract chunks from every .py file under `repo_dir`.
+    Returns (chunks, number_of_files).
+    """
     all_chunks: list[CodeChunk] = []
 
-    py_files = list(REPO_DIR.rglob("*.py"))
-    print(f"[INFO] Found {len(py_files)} Python files under {REPO_DIR}")
+    py_files = list(repo_dir.rglob("*.py"))
+    if verbose:
+        print(f"[INFO] Found {len(py_files)} Python files under {repo_dir}")
 
     for py_file in py_files:
-        print(f"[INFO] Extracting chunks from {py_file}")
-        all_chunks.extend(extract_chunks_from_file(py_file))
+        if verbose:
+            print(f"[INFO] Extracting chunks from {py_file}")
+        all_chunks.extend(extract_chunks_from_file(py_file, repo_dir=repo_dir))
+    return all_chunks, len(py_files)
 
-    if not all_chunks:
-        print("[WARN] No code chunks found. Nothing to index.")
-        return
 
-    print(f"[INFO] Total extracted chunks: {len(all_chunks)}")
+def embed_chunks(chunks: list[CodeChunk], model, show_progress_bar: bool = True) -> np.ndarray:
+    texts = [c.code for c in chunks]
+    embeddings = model.encode(texts, show_progress_bar=show_progress_bar)
+    return np.asarray(embeddings, dtype="float32")
 
-    texts = [c.code for c in all_chunks]
-    embeddings = model.encode(texts, show_progress_bar=True)
-    embeddings = np.asarray(embeddings, dtype="float32")
 
+def build_faiss_index(embeddings: np.ndarray, vector_dtype: str = INDEX_VECTOR_DTYPE):
+    """
+    Exact L2 index over the embeddings, stored as float32 (IndexFlatL2) or
+    scalar-quantized to float16 / int8 (IndexScalarQuantizer, 2x / 4x smaller).
+    """
     d = embeddings.shape[1]
-    index = faiss.IndexFlatL2(d)
+    if vector_dtype == "float32":
+        index = faiss.IndexFlatL2(d)
+    elif vector_dtype in SCALAR_QUANTIZERS:
+        index = faiss.IndexScalarQuantizer(d, SCALAR_QUANTIZERS[vector_dtype], faiss.METRIC_L2)
+        # Learns per-dimension ranges for int8; a no-op for float16
+        index.train(embeddings)
+    else:
+        raise ValueError(
+            f"Unknown INDEX_VECTOR_DTYPE {vector_dtype!r}; expected float32, float16 or int8"
+        )
     index.add(embeddings)
+    return index
 
-    index_path = INDEX_DIR / "code.index"
-    meta_path = INDEX_DIR / "metadata.json"
+
+def write_index(index, chunks: list[CodeChunk], index_dir: Path = INDEX_DIR) -> tuple[Path, Path]:
+    """
+    Write the FAISS index and chunk metadata (ids attached in index order).
+    """
+    index_dir.mkdir(parents=True, exist_ok=True)
+    index_path = index_dir / "code.index"
+    meta_path = index_dir / "metadata.json"
 
     faiss.write_index(index, str(index_path))
+    # Group docs belong to the previous index
+    clear_group_doc_cache(index_dir)
 
     # Attach ids and write metadata
     meta_list = []
-    for i, c in enumerate(all_chunks):
+    for i, c in enumerate(chunks):
         c.id = i
         meta_list.append(c.dict())
 
     with meta_path.open("w") as f:
         json.dump(meta_list, f, indent=2)
+    return index_path, meta_path
+
+
+def main():
+    print(f"[INFO] REPO_DIR = {REPO_DIR}")
+    print(f"[INFO] INDEX_DIR = {INDEX_DIR}")
+
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+
+    model = get_embedding_model()
+
+    all_chunks, _ = collect_chunks(REPO_DIR)
+
+    if not all_chunks:
+        print("[WARN] No code chunks found. Nothing to index.")
+        return
+
+    print(f"[INFO] Total extracted chunks: {len(all_chunks)}")
+
+    dedup_stats = None
+    if DEDUP_ENABLED:
+        all_chunks, dedup_stats = dedupe_chunks(
+            all_chunks, near_dup_threshold=NEAR_DUP_THRESHOLD
+        )
+        print(
+            f"[INFO] Dedup: {dedup_stats['total_chunks']} chunks -> "
+            f"{dedup_stats['canonical_chunks']} canonical "
+            f"({dedup_stats['exact_duplicates']} exact duplicates folded into aliases, "
+            f"{dedup_stats['near_duplicates']} near duplicates flagged)"
+        )
+
+    embeddings = embed_chunks(all_chunks, model)
+    d = embeddings.shape[1]
+    index = build_faiss_index(embeddings)
+
+    index_path, meta_path = write_index(index, all_chunks, INDEX_DIR)
 
     print(f"[INFO] Wrote FAISS index to {index_path}")
-    print(f"[INFO] Wrote metadata for {len(meta_list)} chunks to {meta_path}")
+    print(f"[INFO] Wrote metadata for {len(all_chunks)} chunks to {meta_path}")
+
+    if dedup_stats is not None:
+        write_dedup_report(dedup_stats, dim=d, bytes_per_dim=BYTES_PER_DIM[INDEX_VECTOR_DTYPE])
+
+
+def write_dedup_report(stats: dict, dim: int, bytes_per_dim: int = 4):
+    """
+    Report index size and LLM-call savings from dedup, and persist it
+    next to the index as dedup_report.json.
+    """
+    bytes_per_vector = dim * bytes_per_dim
+    report = dict(stats)
+    report["index_bytes_without_dedup"] = stats["total_chunks"] * bytes_per_vector
+    report["index_bytes_with_dedup"] = stats["canonical_chunks"] * bytes_per_vector
+    # Every duplicate would otherwise cost one doc-writer and one evaluator
+    # call; groups are documented once and shared via the group doc cache
+    report["llm_calls_saved_per_full_run"] = stats["duplicate_chunks"] * 2
+
+    report_path = INDEX_DIR / "dedup_report.json"
+    with report_path.open("w") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        f"[INFO] Index size: {report['index_bytes_with_dedup'] / 1024:.1f} KiB "
+        f"(vs {report['index_bytes_without_dedup'] / 1024:.1f} KiB without dedup)"
+    )
+    print(
+        f"[INFO] LLM calls saved when documenting every chunk: "
+        f"{report['llm_calls_saved_per_full_run']}"
+    )
+    print(f"[INFO] Wrote dedup report to {report_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,212 @@
+"""
+Local OpenAI-compatible mock LLM server for offline load tests.
+
+Serves POST /v1/chat/completions with deterministic canned responses
+(the same ones as the in-process FakeBackend) and can simulate:
+- response latency (fixed + seeded jitter)
+- rate limiting (token bucket, HTTP 429 with Retry-After)
+- transient upstream failures (HTTP 503 with a given probability)
+
+Usage:
+    python scripts/mock_llm_server.py --port 8765 --latency-ms 300 --rps 5
+    LLM_BACKEND=openai LLM_BASE_URL=http://127.0.0.1:8765/v1 \\
+        python scripts/run_cli_demo.py <module_path>
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Make sure the project root is on sys.path ---
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.tools.heuristics import estimate_tokens
+from app.tools.llm_backend import fake_completion
+
+
+class MockLLMState:
+    """
+    Shared latency / rate-limit / failure simulation for all handler threads.
+    """
+
+    def __init__(self, latency_ms: float, jitter_ms: float, rps: float, burst: int, error_rate: float, seed: int):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rps = rps
+        self.burst = burst
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0}
+
+    def admit(self) -> tuple[str, float]:
+        """
+        Decide the outcome of one request: ("ok" | "rate_limited" | "error", delay_or_retry_after).
+        """
+        with self.lock:
+            self.stats["requests"] += 1
+
+            if self.rps > 0:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rps)
+                self.last_refill = now
+                if self.tokens < 1:
+                    self.stats["rate_limited"] += 1
+                    return "rate_limited", (1 - self.tokens) / self.rps
+                self.tokens -= 1
+
+            if self.error_rate and self.rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return "error", 0.0
+
+            self.stats["ok"] += 1
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+            return "ok", max(0.0, self.latency_ms + jitter) / 1000.0
+
+
+def make_handler(state: MockLLMState):
+    class MockLLMHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse connections
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, body: dict, headers: dict | None = None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                with state.lock:
+                    self._send_json(200, dict(state.stats))
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", "0"))
+            raw = self.rfile.read(length)
+
+            if self.path.rstrip("/") != "/v1/chat/completions":
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+            try:
+                payload = json.loads(raw)
+                messages = payload["messages"]
+            except (ValueError, KeyError):
+                self._send_json(400, {"error": {"message": "invalid request body"}})
+                return
+
+            outcome, delay = state.admit()
+            if outcome == "rate_limited":
+                self._send_json(
+                    429,
+                    {"error": {"message": "rate limit exceeded", "type": "rate_limit"}},
+                    headers={"Retry-After": f"{delay:.3f}"},
+                )
+                return
+            if outcome == "error":
+                self._send_json(503, {"error": {"message": "simulated upstream failure"}})
+                return
+
+            time.sleep(delay)
+            system_prompt = next((m["content"] for m in messages if m.get("role") == "system"), "")
+            user_prompt = next((m["content"] for m in messages if m.get("role") == "user"), "")
+            content = fake_completion(system_prompt, user_prompt)
+            prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+            completion_tokens = estimate_tokens(content)
+
+            self._send_json(
+                200,
+                {
+                    "id": f"mock-{state.stats['requests']}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": payload.get("model", "mock"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                },
+            )
+
+    return MockLLMHandler
+
+
+def build_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    rps: float = 0.0,
+    burst: int = 1,
+    error_rate: float = 0.0,
+    seed: int = 0,
+) -> ThreadingHTTPServer:
+    """
+    Create (but don't start) a mock server; use port=0 for a free port.
+    """
+    state = MockLLMState(latency_ms, jitter_ms, rps, max(1, burst), error_rate, seed)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    server.mock_state = state
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="Uniform +/- latency jitter")
+    parser.add_argument("--rps", type=float, default=0.0, help="Allowed requests/s (0 = unlimited)")
+    parser.add_argument("--burst", type=int, default=5, help="Token bucket size for --rps")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an HTTP 503")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = build_server(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rps=args.rps,
+        burst=args.burst,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    print(f"[INFO] Mock LLM server on http://{args.host}:{server.server_port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"[INFO] Stats: {server.mock_state.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,17 @@ def main():
     print("#" * 80 + "\n")
     pprint(state.evaluations)
 
+    print("\n" + "#" * 80)
+    print("LLM CALLS")
+    print("#" * 80 + "\n")
+    for call in state.llm_call_log:
+        flag = " (condensed)" if call.condensed else ""
+        print(
+            f"{call.kind:4s} {call.symbol_name}: prompt={call.prompt_tokens} "
+            f"response={call.response_tokens} tokens, {call.latency_s:.2f}s{flag}"
+        )
+    print(f"\nTotal: {state.llm_calls} calls, ~{state.tokens_spent} tokens")
+
 
 if __name__ == "__main__":
     main()
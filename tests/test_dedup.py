@@ -0,0 +1,53 @@
+from app.models import CodeChunk
+from app.tools.dedup import dedupe_chunks, normalized_ast_hash
+
+
+def _chunk(symbol_name: str, code: str, start_line: int = 1) -> CodeChunk:
+    return CodeChunk(
+        id=start_line,
+        file_path="a.py",
+        symbol_name=symbol_name,
+        start_line=start_line,
+        end_line=start_line + 1,
+        code=code,
+    )
+
+
+def test_free_names_are_not_renamed():
+    total = "def total(xs):\n    return sum(xs)\n"
+    biggest = "def biggest(xs):\n    return max(xs)\n"
+    assert normalized_ast_hash(total) != normalized_ast_hash(biggest)
+
+    canonicals, stats = dedupe_chunks([_chunk("total", total, 1), _chunk("biggest", biggest, 4)])
+    assert stats["canonical_chunks"] == 2
+    assert stats["exact_duplicates"] == 0
+
+
+def test_renamed_locals_are_exact_duplicates():
+    a = 'def total(xs):\n    """Sum."""\n    acc = 0\n    for x in xs:\n        acc += x\n    return acc\n'
+    b = "def add_all(items):\n    s = 0\n    for i in items:\n        s += i\n    return s\n"
+    assert normalized_ast_hash(a) == normalized_ast_hash(b)
+
+
+def _stats_function(name: str, reducer: str) -> str:
+    lines = [f"def {name}(records, key=None, default=0):"]
+    lines += ["    values = []", "    for record in records:", "        if record is None:", "            continue"]
+    lines += ["        value = record[key] if key else record", "        if value is None:", "            continue"]
+    lines += ["        values.append(value)", "    if not values:", "        return default"]
+    lines += ["    cleaned = [v for v in values if v == v]", "    if not cleaned:", "        return default"]
+    lines += [f"    result = {reducer}(cleaned)", "    if result < 0:", "        result = 0", "    return result"]
+    return "\n".join(lines) + "\n"
+
+
+def test_near_duplicates_are_flagged_not_merged():
+    total_of = _stats_function("total_of", "sum")
+    max_of = _stats_function("max_of", "max")
+
+    canonicals, stats = dedupe_chunks([_chunk("total_of", total_of, 1), _chunk("max_of", max_of, 30)])
+    assert stats["canonical_chunks"] == 2
+    assert stats["near_duplicates"] == 1
+
+    by_name = {c.symbol_name: c for c in canonicals}
+    assert by_name["max_of"].code == max_of
+    assert not by_name["total_of"].aliases and not by_name["max_of"].aliases
+    assert by_name["max_of"].near_duplicate_of == by_name["total_of"].group_id
@@ -0,0 +1,16 @@
+from app.tools.group_cache import GroupDocCache
+
+
+def test_group_docs_persist_across_instances(tmp_path):
+    path = tmp_path / "group_docs.json"
+    cache = GroupDocCache(path)
+    cache.put_doc("abc", "Sums the items.")
+    cache.put_evaluation("abc", "Sums the items.", {"overall_score": 4})
+
+    # A later pipeline run (new process) sees the same doc and scores
+    reloaded = GroupDocCache(path)
+    assert reloaded.get_doc("abc") == "Sums the items."
+    assert reloaded.get_evaluation("abc", "Sums the items.") == {"overall_score": 4}
+    # Scores are only reused for the doc they were given to
+    assert reloaded.get_evaluation("abc", "Another doc.") is None
+    assert reloaded.get_doc("missing") is None
@@ -0,0 +1,64 @@
+import pytest
+
+from app.tools.llm_backend import CircuitBreaker, CircuitOpenError, LLMBackend, LLMError
+
+
+class _FailingBackend(LLMBackend):
+    def __init__(self, error: Exception, **kwargs):
+        kwargs.setdefault("backoff_base_s", 0.0)
+        kwargs.setdefault("backoff_max_s", 0.0)
+        super().__init__(**kwargs)
+        self.error = error
+        self.attempts = 0
+
+    def _complete(self, system_prompt, user_prompt, temperature, max_tokens):
+        self.attempts += 1
+        raise self.error
+
+
+def _call(backend: LLMBackend):
+    try:
+        backend.chat("system", "user")
+    except CircuitOpenError:
+        return "open"
+    except Exception:
+        return "error"
+    return "ok"
+
+
+def test_retries_count_as_one_breaker_failure():
+    backend = _FailingBackend(
+        LLMError("unavailable", status_code=503),
+        max_retries=4,
+        circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout_s=60),
+    )
+    assert _call(backend) == "error"
+    assert backend.attempts == 5
+    # One exhausted call is below the threshold: the next call reaches upstream
+    assert _call(backend) == "error"
+    assert backend.attempts == 10
+    assert _call(backend) == "open"
+
+
+def test_client_errors_do_not_open_the_breaker():
+    backend = _FailingBackend(
+        LLMError("bad request", status_code=400),
+        circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout_s=60),
+    )
+    assert [_call(backend) for _ in range(3)] == ["error"] * 3
+    assert backend.attempts == 3
+
+
+def test_unexpected_error_releases_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0.0)
+    backend = _FailingBackend(LLMError("down", status_code=503), max_retries=0, circuit_breaker=breaker)
+    assert _call(backend) == "error"  # opens the breaker
+
+    backend.error = ValueError("malformed response")
+    with pytest.raises(ValueError):
+        backend.chat("system", "user")  # the half-open probe
+
+    # The probe was released, so the next call is allowed through
+    backend.error = LLMError("down", status_code=503)
+    assert _call(backend) == "error"
+    assert backend.attempts == 3
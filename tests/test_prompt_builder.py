@@ -0,0 +1,40 @@
+from app.tools.heuristics import estimate_tokens
+from app.tools.prompt_builder import build_eval_prompt, condense_code
+
+
+def test_condense_code_handles_match_statement():
+    lines = ["def dispatch(cmd):"]
+    lines += [f"    step_{i} = cmd + {i}" for i in range(200)]
+    lines += ["    match cmd:", "        case 1:", "            return 'one'", "        case _:"]
+    lines += [f"            other_{i} = {i}" for i in range(100)]
+    lines += ["            return 'other'"]
+
+    code, condensed = condense_code("\n".join(lines) + "\n", 300)
+    assert condensed
+    assert estimate_tokens(code) <= 300
+    assert "match cmd:" in code
+
+
+def test_condense_code_keeps_key_statements_and_fills_budget():
+    body = [f"    value_{i} = combine(value_{i - 1}, factor={i}) + offset_{i}" for i in range(1, 600)]
+    code = "\n".join(
+        ['def flat(x):', '    """Fold the offsets into x."""', "    value_0 = x"]
+        + body
+        + ["    return value_599"]
+    ) + "\n"
+
+    condensed_code, condensed = condense_code(code, 800)
+    assert condensed
+    assert '"""Fold the offsets into x."""' in condensed_code
+    assert "return value_599" in condensed_code
+    # Uses most of the budget instead of collapsing to the signature
+    assert 600 <= estimate_tokens(condensed_code) <= 800
+
+
+def test_eval_prompt_flags_truncated_doc():
+    prompt = build_eval_prompt("def f():\n    return 1\n", "word " * 5000, max_tokens=1000)
+    assert prompt.condensed
+    assert "truncated" in prompt.user
+
+    prompt = build_eval_prompt("def f():\n    return 1\n", "Returns one.", max_tokens=1000)
+    assert not prompt.condensed